@@ -0,0 +1,59 @@
+"""
+Measures the import time of fredlib, each import in a fresh interpreter, and checks that importing the package does
+not import its heavy dependencies.
+
+Usage: python benchmarks/import_time.py [repeat]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATH = [os.path.join(ROOT, "fredlib"), ROOT]
+HEAVY = ("numpy", "requests", "networkx", "matplotlib")
+
+CASES = (
+    ("import fredlib", "import fredlib"),
+    ("Database", "from fredlib import Database"),
+    ("get_observables", "from fredlib import get_observables"),
+    ("CategoryTree", "from fredlib import CategoryTree"),
+    ("SeriesGraph", "from fredlib import SeriesGraph"),
+    ("everything", "from fredlib import *"),
+)
+
+CODE = """
+import sys, time
+sys.path[:0] = %r
+start = time.perf_counter()
+%s
+elapsed = time.perf_counter() - start
+print(elapsed * 1000)
+print(",".join(name for name in %r if name in sys.modules))
+"""
+
+
+def measure(statement: str):
+    """
+    Runs the statement in a fresh interpreter and returns the milliseconds it took and the heavy dependencies imported.
+    """
+    result = subprocess.run([sys.executable, "-c", CODE % (PATH, statement, HEAVY)], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(statement + " has failed:\n" + result.stderr)
+    elapsed, heavy = (result.stdout.splitlines() + [""])[:2]
+    return float(elapsed), [name for name in heavy.split(",") if name != ""]
+
+
+def main(repeat: int = 5):
+    for name, statement in CASES:
+        measures = [measure(statement) for _ in range(repeat)]
+        heavy = measures[0][1]
+        print("%-16s %8.1f ms   %s" % (name, statistics.median(elapsed for elapsed, _ in measures),
+                                       ", ".join(heavy) if len(heavy) != 0 else "-"))
+        if statement == "import fredlib":
+            assert len(heavy) == 0, "import fredlib has imported " + ", ".join(heavy)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
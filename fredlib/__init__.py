@@ -1,4 +1,40 @@
-from api import *
-from model import *
-from tree import *
-from graphs import *
\ No newline at end of file
+"""
+The public names of the modules of the package are loaded on first access, so that importing the package does not
+import numpy, requests, networkx or matplotlib until they are needed, for example:
+from fredlib import get_observables only loads the modules needed to read the database and call FRED.
+
+For the same reason the modules import requests, networkx and matplotlib inside the functions that use them: requests
+when the first request is made, networkx when the graph of a tree is built and matplotlib when a graph is drawn.
+The import time of the package can be measured with benchmarks/import_time.py.
+"""
+
+import importlib
+
+# the modules exporting their public names, cheapest first: a name found in more than one module is always the same
+# object, re-exported by a star import
+_modules = ("model", "tree", "api", "frame", "graphs")
+
+
+def _public_names(module):
+    return [name for name in vars(module) if not name.startswith("_")]
+
+
+def __getattr__(name):
+    if name == "__all__":
+        # from fredlib import * loads every module
+        names = list(dict.fromkeys(name for module_name in _modules
+                                   for name in _public_names(importlib.import_module(module_name))))
+        globals()["__all__"] = names
+        return names
+    if not name.startswith("_"):
+        for module_name in _modules:
+            module = importlib.import_module(module_name)
+            if name in vars(module):
+                value = vars(module)[name]
+                globals()[name] = value
+                return value
+    raise AttributeError("module " + repr(__name__) + " has no attribute " + repr(name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__getattr__("__all__")))
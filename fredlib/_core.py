@@ -7,13 +7,18 @@ own functions and use our package for interacting with fred please read this doc
 
 import enum
 from model import *
-import requests
 import json
 import sqlite3
+import threading
+import time
+import os
+import hashlib
+import weakref
 from typing import List, Any
 from datetime import datetime as dt
+import numpy as np
 
-_database_configuration = {"tables": ["series", "observables", "categories"],
+_database_configuration = {"tables": ["series", "observables", "categories", "derived_series", "crawl_state"],
                            "rows": {
                                "series": [("series_id", "TEXT PRIMARY KEY"), ("title", "TEXT"),
                                           ("last_updated", "TEXT"), ("observation_start", "TEXT"),
@@ -24,11 +29,55 @@ _database_configuration = {"tables": ["series", "observables", "categories"],
                                                ("value", "REAL"), ("series_id",
                                                                    "TEXT REFERENCES series(series_id) ON DELETE CASCADE ON UPDATE CASCADE")],
                                "categories": [("category_id", "INTEGER PRIMARY KEY"), ("name", "TEXT"),
-                                              ("parent_id", "INTEGER")]
+                                              ("parent_id", "INTEGER")],
+                               "derived_series": [("derived_id", "TEXT PRIMARY KEY"), ("series_id", "TEXT"),
+                                                  ("transform", "TEXT"), ("parameters", "TEXT"),
+                                                  ("last_updated", "TEXT"), ("dates", "BLOB"), ("vals", "BLOB"),
+                                                  ("state", "TEXT")],
+                               # checked is NULL until the children of the category have been downloaded and saved,
+                               # categories without a row were saved by complete crawls
+                               "crawl_state": [("category_id", "INTEGER PRIMARY KEY"), ("checked", "TEXT")]
                            }}
 
 
-class BadRequestException(Exception):
+# full-text indexes over category names and series titles: table -> (definition, query filling it from existing data)
+_search_configuration = {"categories_search": ("fts5(category_id UNINDEXED, name)",
+                                               "SELECT category_id, name FROM categories"),
+                         "series_search": ("fts5(series_id UNINDEXED, title)", "SELECT series_id, title FROM series")}
+
+
+def _search_query(text: str, prefix: bool) -> str:
+    """
+    Private function. Converts free text into an FTS5 query matching all its words (as prefixes if prefix is true).
+    """
+    words = [word for word in "".join(char if char.isalnum() else " " for char in text).split()]
+    return " ".join('"' + word + '"' + ("*" if prefix else "") for word in words)
+
+
+def _derived_id(series_id, transform, parameters) -> str:
+    """
+    Private function. Builds the key of a derived series in the derived_series table.
+    """
+    return str(series_id) + "|" + str(transform) + "|" + str(parameters)
+
+
+class _PackageError(Exception):
+    """
+    This class is private and undocumented, you must not use this class.
+    Base of the exceptions whose message is built from their constructor arguments: they are pickled with those
+    arguments, so that they can be sent back by worker processes.
+    """
+
+    def __new__(cls, *args):
+        error = super().__new__(cls, *args)
+        error._arguments = args
+        return error
+
+    def __reduce__(self):
+        return self.__class__, self._arguments
+
+
+class BadRequestException(_PackageError):
     """
     ..autoexception::BadRequestException
 
@@ -40,9 +89,10 @@ class BadRequestException(Exception):
 
     def __init__(self, status_code):
         super().__init__("Request has failed with HTTP code: " + str(status_code))
+        self.status_code = status_code
 
 
-class NotSupportedModelType(Exception):
+class NotSupportedModelType(_PackageError):
     """
     ..autoexception::NotSupportedModelType
 
@@ -56,7 +106,7 @@ class NotSupportedModelType(Exception):
         super().__init__("ModelType not supported. Type used: " + str(model_type))
 
 
-class CategoryNotFound(Exception):
+class CategoryNotFound(_PackageError):
     """
     ..autoexception::CategoryNotFound
 
@@ -70,7 +120,7 @@ class CategoryNotFound(Exception):
         super().__init__("Category with id " + str(category_id) + " not found")
 
 
-class BadDatabaseQuery(Exception):
+class BadDatabaseQuery(_PackageError):
     """
     ..autoexception::BadDatabaseQuery
 
@@ -84,7 +134,7 @@ class BadDatabaseQuery(Exception):
         super().__init__("Invalid query: " + str(query))
 
 
-class NotSupportedOperation(Exception):
+class NotSupportedOperation(_PackageError):
     """
     ..autoexception::NotSupportedOperation
 
@@ -95,7 +145,7 @@ class NotSupportedOperation(Exception):
         super().__init__("Operation not supported")
 
 
-class DatabaseWritingError(Exception):
+class DatabaseWritingError(_PackageError):
     """
     ..autoexception::DatabaseWritingError
 
@@ -111,7 +161,7 @@ class DatabaseWritingError(Exception):
         super().__init__("Query :" + str(query) + " has failed with error:" + str(error))
 
 
-class SeriesNotFound(Exception):
+class SeriesNotFound(_PackageError):
     """
     ..autoexception::SeriesNotFound
 
@@ -135,6 +185,36 @@ class ModelType(enum.Enum):
     Observable = 3
 
 
+class RateLimiter:
+    """
+    ..autoclass::RateLimiter
+
+    This class spaces out the requests made to FRED so that they do not exceed a given rate.
+    It is thread safe, so a single instance can be shared by all the threads making requests.
+    """
+
+    def __init__(self, requests_per_minute=120):
+        """
+
+        :param requests_per_minute: The maximum number of requests per minute, defaults to 120 (the limit of FRED's API)
+        :type requests_per_minute: int
+        """
+        self.interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self):
+        """
+        This method blocks the calling thread until it is allowed to make a request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
 class DataManager:
     """
     ..autoclass::DataManager
@@ -196,14 +276,20 @@ class Fred(DataManager):
     It also parses json responses, building the appropriate :class:`ModelType` object representing the data.
     """
 
-    def __init__(self, key):
+    def __init__(self, key, rate_limiter=None, session=None):
         """
 
         :param key: The FRED's API key to use in request operation
         :type key: str
+        :param rate_limiter: A rate limiter shared by the objects that make requests concurrently, defaults to None (no limit)
+        :type rate_limiter: RateLimiter
+        :param session: An HTTP session whose connections are reused across requests, defaults to None (a new connection for each request)
+        :type session: requests.Session
         """
         self.key = key
         self.final_url = "&api_key=" + key + "&file_type=json"
+        self.rate_limiter = rate_limiter
+        self.session = session
 
     def _get(self, query):
         '''
@@ -217,7 +303,13 @@ class Fred(DataManager):
         :rtype: Any
         '''
         url = query + self.final_url
-        request = requests.get(url)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        if self.session is None:
+            import requests
+            request = requests.get(url)
+        else:
+            request = self.session.get(url)
         status_code = request.status_code
         if status_code != 200:
             raise BadRequestException(status_code)
@@ -378,6 +470,16 @@ class Database(DataManager):
                     attributes += row[0] + " " + row[1]
                 statement = "CREATE TABLE " + table + "(" + attributes + ");"
                 cur.execute(statement)
+        for table, (definition, content) in _search_configuration.items():
+            if not (table in list_of_tables):
+                try:
+                    cur.execute("CREATE VIRTUAL TABLE " + table + " USING " + definition + ";")
+                    cur.execute("INSERT INTO " + table + " " + content + ";")
+                    list_of_tables.append(table)
+                except sqlite3.OperationalError:
+                    # the SQLite library was built without FTS5
+                    continue
+        self.search_enabled = all(table in list_of_tables for table in _search_configuration)
         self.con.commit()
 
     def destroy(self):
@@ -459,6 +561,19 @@ class Database(DataManager):
         else:
             raise CategoryNotFound(category_id)
 
+    def get_categories_version(self) -> str:
+        """
+        This method computes a fingerprint of the content of the categories table, which changes whenever a category is
+        added, removed, renamed or moved. Use it to check if data derived from the categories, such as a tree snapshot, is still valid.
+
+        :return: A hexadecimal digest of the categories table
+        :rtype: str
+        """
+        digest = hashlib.sha1()
+        for row in self._get("SELECT category_id, parent_id, name FROM categories ORDER BY category_id;"):
+            digest.update((str(row[0]) + "\x1f" + str(row[1]) + "\x1f" + str(row[2]) + "\x1e").encode("utf-8"))
+        return digest.hexdigest()
+
     def get_categories_by_parent_id(self, parent_id) -> []:
         """
         This method fetches from the database all the children categories of a parent category, given the parent category identifier.
@@ -494,10 +609,49 @@ class Database(DataManager):
         :return: A list of :class:`Series` object.
         :rtype: List[Series]
         """
-        statement = "SELECT * FROM observables WHERE series_id ='" + str(series) + "';"
+        statement = "SELECT * FROM observables WHERE series_id ='" + str(series) + "' ORDER BY date;"
         rows = self._get(statement)
         return self._parse(ModelType.Observable, rows)
 
+    def get_observable_arrays(self, series) -> (np.ndarray, np.ndarray):
+        """
+        This method fetches from the database all the observables of a time series in columnar form, ordered by date.
+        Use this method instead of :py:meth:`get_observables` when the data is going to be processed with numpy,
+        since no :class:`Observable` object is built.
+
+        :param series: The series identifier of the series
+        :type series: str
+        :return: Two numpy arrays: the dates of the observables (datetime64[D]) and their values (float64)
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        statement = "SELECT date, value FROM observables WHERE series_id ='" + str(series) + "' ORDER BY date;"
+        rows = self._get(statement)
+        if len(rows) == 0:
+            return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
+        dates, values = zip(*rows)
+        return np.array(dates, dtype="datetime64[D]"), np.array(values, dtype=np.float64)
+
+    def get_observables_many(self, series_ids) -> dict:
+        """
+        This method fetches from the database all the observables of many time series with a single query for each
+        block of 500 series.
+
+        :param series_ids: The series identifiers of the series
+        :type series_ids: List[str]
+        :return: A dictionary mapping each series identifier to the list of its :class:`Observable` objects, ordered by date. Series without observables in the database are not in the dictionary.
+        :rtype: Dict[str, List[Observable]]
+        """
+        series_ids = list(series_ids)
+        result = {}
+        cur = self.con.cursor()
+        for start in range(0, len(series_ids), 500):
+            block = series_ids[start:start + 500]
+            cur.execute("SELECT * FROM observables WHERE series_id IN (" + ",".join("?" * len(block)) +
+                        ") ORDER BY series_id, date;", [str(series_id) for series_id in block])
+            for observable in self._parse(ModelType.Observable, cur.fetchall()):
+                result.setdefault(observable.series_id, []).append(observable)
+        return result
+
     def _push(self, query):
         """
         This method performs a generic write operation into the database.
@@ -526,6 +680,136 @@ class Database(DataManager):
         statement = "INSERT INTO categories VALUES ('" + str(category.category_id) + "','" + str(
             category.name) + "'," + str(category.parent_id) + ");"
         self._push(statement)
+        self._push_search("INSERT INTO categories_search VALUES (?, ?);", (category.category_id, str(category.name)))
+
+    def insert_categories_many(self, categories: List[Category]) -> int:
+        """
+        This method saves many :class:`Category` objects into the database in a single transaction.
+        The categories that are already in the database are skipped, the new ones are recorded as not crawled yet (their children are unknown).
+
+        :param categories: The :class:`Category` objects to be saved
+        :type categories: List[Category]
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database. In that case no category is saved
+        :return: The number of categories actually saved
+        :rtype: int
+        """
+        try:
+            with self.con:
+                return self._insert_categories(categories)
+        except sqlite3.Error as e:
+            raise DatabaseWritingError("INSERT OR IGNORE INTO categories", e.args[0])
+
+    def _insert_categories(self, categories):
+        inserted = 0
+        for category in categories:
+            cur = self.con.execute("INSERT OR IGNORE INTO categories VALUES (?, ?, ?);",
+                                   (category.category_id, str(category.name), category.parent_id))
+            if cur.rowcount == 1:
+                inserted += 1
+                self.con.execute("INSERT OR IGNORE INTO crawl_state VALUES (?, NULL);", (category.category_id,))
+                if self.search_enabled:
+                    self.con.execute("INSERT INTO categories_search VALUES (?, ?);",
+                                     (category.category_id, str(category.name)))
+        return inserted
+
+    def insert_crawled_categories(self, children: dict):
+        """
+        This method saves the children of some categories downloaded during a crawl, and records that the children of
+        those categories are known, in a single transaction.
+
+        :param children: A dictionary mapping the category identifier of each crawled category to the list of its children
+        :type children: Dict[int, List[Category]]
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database. In that case nothing is saved
+        """
+        checked = dt.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.con:
+                for category_id, categories in children.items():
+                    self._insert_categories(categories)
+                    self.con.execute("INSERT OR REPLACE INTO crawl_state VALUES (?, ?);", (category_id, checked))
+        except sqlite3.Error as e:
+            raise DatabaseWritingError("INSERT OR REPLACE INTO crawl_state", e.args[0])
+
+    def get_crawl_checked(self, category_ids) -> dict:
+        """
+        This method fetches from the database when the children of the given categories were last downloaded.
+
+        :param category_ids: The category identifiers of the categories
+        :type category_ids: List[int]
+        :return: A dictionary mapping each category identifier to the UTC time of the last download ("YYYY-MM-DD HH:MM:SS"), or to None if it is unknown
+        :rtype: Dict[int, str]
+        """
+        category_ids = [int(category_id) for category_id in category_ids]
+        result = dict.fromkeys(category_ids)
+        cur = self.con.cursor()
+        for start in range(0, len(category_ids), 500):
+            block = category_ids[start:start + 500]
+            cur.execute("SELECT category_id, checked FROM crawl_state WHERE category_id IN (" +
+                        ",".join("?" * len(block)) + ");", block)
+            result.update(cur.fetchall())
+        return result
+
+    def apply_category_changes(self, children: dict, moved: List[Category], removed: List[int]):
+        """
+        This method applies the changes found by a synchronization of the category tree in a single transaction: the
+        new children lists of the checked categories are saved (and the categories marked as crawled), the moved
+        categories get their new parent and the removed categories are deleted.
+
+        :param children: A dictionary mapping the category identifier of each checked category to the list of its children
+        :type children: Dict[int, List[Category]]
+        :param moved: The moved categories, with their new parent_id
+        :type moved: List[Category]
+        :param removed: The category identifiers of the removed categories
+        :type removed: List[int]
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database. In that case nothing is changed
+        """
+        checked = dt.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            with self.con:
+                for category_id in removed:
+                    self.con.execute("DELETE FROM categories WHERE category_id = ?;", (category_id,))
+                    self.con.execute("DELETE FROM crawl_state WHERE category_id = ?;", (category_id,))
+                    if self.search_enabled:
+                        self.con.execute("DELETE FROM categories_search WHERE category_id = ?;", (category_id,))
+                for category in moved:
+                    self.con.execute("UPDATE categories SET parent_id = ? WHERE category_id = ?;",
+                                     (category.parent_id, category.category_id))
+                for category_id, categories in children.items():
+                    self._insert_categories(categories)
+                    self.con.execute("INSERT OR REPLACE INTO crawl_state VALUES (?, ?);", (category_id, checked))
+        except sqlite3.Error as e:
+            raise DatabaseWritingError("apply_category_changes", e.args[0])
+
+    def get_crawled_children(self, category_ids) -> dict:
+        """
+        This method fetches from the database the children of the given categories, skipping the categories whose
+        children have not been downloaded yet. It makes a few queries for each block of 500 categories.
+
+        :param category_ids: The category identifiers of the parent categories
+        :type category_ids: List[int]
+        :return: A dictionary mapping the identifier of each crawled category to the list of its children (empty for the categories without children)
+        :rtype: Dict[int, List[Category]]
+        """
+        category_ids = list(category_ids)
+        result = {}
+        cur = self.con.cursor()
+        for start in range(0, len(category_ids), 500):
+            block = [int(category_id) for category_id in category_ids[start:start + 500]]
+            placeholders = "(" + ",".join("?" * len(block)) + ")"
+            cur.execute("SELECT category_id FROM crawl_state WHERE checked IS NULL AND category_id IN " + placeholders +
+                        ";", block)
+            pending = set(row[0] for row in cur.fetchall())
+            crawled = [category_id for category_id in block if category_id not in pending]
+            for category_id in crawled:
+                result[category_id] = []
+            if len(crawled) == 0:
+                continue
+            cur.execute("SELECT * FROM categories WHERE parent_id IN (" + ",".join("?" * len(crawled)) + ");", crawled)
+            for category in self._parse(ModelType.Category, cur.fetchall()):
+                # the root category of FRED is its own parent
+                if category.category_id != category.parent_id:
+                    result[category.parent_id].append(category)
+        return result
 
     def insert_series(self, series: Series):
         """
@@ -539,6 +823,7 @@ class Database(DataManager):
             series.observation_start) + "'," + "'" + str(series.observation_end) + "'," + "'" + str(
             series.frequency_short.value) + "'," + str(series.category_id) + ");"
         self._push(statement)
+        self._push_search("INSERT INTO series_search VALUES (?, ?);", (str(series.series_id), str(series.title)))
 
     def insert_observables(self, observable: Observable):
         """
@@ -553,6 +838,23 @@ class Database(DataManager):
             observable.value) + ",'" + str(observable.series_id) + "');"
         self._push(statement)
 
+    def insert_observables_many(self, observables: List[Observable]):
+        """
+        This method saves many :class:`Observable` objects into the database in a single transaction
+
+        :param observables: The :class:`Observable` objects to be saved
+        :type observables: List[Observable]
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database. In that case no observable is saved
+        """
+        attributes = _database_configuration["rows"]["observables"]
+        columns = attributes[1][0] + "," + attributes[2][0] + "," + attributes[3][0]
+        statement = "INSERT INTO observables (" + columns + ") VALUES (?, ?, ?);"
+        try:
+            with self.con:
+                self.con.executemany(statement, ((str(obs.date), obs.value, str(obs.series_id)) for obs in observables))
+        except sqlite3.Error as e:
+            raise DatabaseWritingError(statement, e.args[0])
+
     def delete_series(self, series: Series):
         """
         This method deletes a single :class:`Series` object from the database
@@ -562,6 +864,71 @@ class Database(DataManager):
         """
         statement = "DELETE  FROM series WHERE series_id='" + series.series_id + "';"
         self._push(statement)
+        self._push_search("DELETE FROM series_search WHERE series_id = ?;", (str(series.series_id),))
+
+    def _push_search(self, statement, parameters):
+        """
+        This private method keeps the full-text indexes up to date, it does nothing if they are not available.
+
+        :param statement: The SQL operation to be performed on a full-text index
+        :type statement: str
+        :param parameters: The parameters of the operation
+        :type parameters: tuple
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database
+        """
+        if not self.search_enabled:
+            return
+        try:
+            with self.con:
+                self.con.execute(statement, parameters)
+        except sqlite3.Error as e:
+            raise DatabaseWritingError(statement, e.args[0])
+
+    def search_categories(self, text: str, limit=20, prefix=True) -> List[Category]:
+        """
+        This method searches the categories whose name contains all the words of a text, best matches first.
+
+        :param text: The words to search
+        :type text: str
+        :param limit: The maximum number of categories returned, defaults to 20
+        :type limit: int
+        :param prefix: If true, each word also matches the words starting with it, defaults to True
+        :type prefix: bool
+        :raises NotSupportedOperation: Raised when the SQLite library does not support full-text search (FTS5)
+        :return: A list of :class:`Category` objects
+        :rtype: List[Category]
+        """
+        return self._parse(ModelType.Category, self._search(
+            "SELECT c.* FROM categories_search s JOIN categories c ON c.category_id = s.category_id "
+            "WHERE categories_search MATCH ? ORDER BY s.rank LIMIT ?;", text, limit, prefix))
+
+    def search_series(self, text: str, limit=20, prefix=True) -> List[Series]:
+        """
+        This method searches the series whose title contains all the words of a text, best matches first.
+
+        :param text: The words to search
+        :type text: str
+        :param limit: The maximum number of series returned, defaults to 20
+        :type limit: int
+        :param prefix: If true, each word also matches the words starting with it, defaults to True
+        :type prefix: bool
+        :raises NotSupportedOperation: Raised when the SQLite library does not support full-text search (FTS5)
+        :return: A list of :class:`Series` objects
+        :rtype: List[Series]
+        """
+        return self._parse(ModelType.Series, self._search(
+            "SELECT r.* FROM series_search s JOIN series r ON r.series_id = s.series_id "
+            "WHERE series_search MATCH ? ORDER BY s.rank LIMIT ?;", text, limit, prefix))
+
+    def _search(self, statement, text, limit, prefix):
+        if not self.search_enabled:
+            raise NotSupportedOperation()
+        query = _search_query(text, prefix)
+        if len(query) == 0:
+            return []
+        cur = self.con.cursor()
+        cur.execute(statement, (query, limit))
+        return cur.fetchall()
 
     def is_new_series(self, series: Series) -> bool:
         """
@@ -582,6 +949,28 @@ class Database(DataManager):
         except SeriesNotFound:
             return True
 
+    def get_freshness_many(self, series_ids) -> dict:
+        """
+        This method fetches, with a single query for each block of 500 series, what :py:meth:`is_new_series` needs to
+        know about many series: their saved last_updated value and whether they have saved observables.
+
+        :param series_ids: The series identifiers of the series
+        :type series_ids: List[str]
+        :return: A dictionary mapping each series identifier to a tuple (last_updated, has_observables). Series not saved in the database are not in the dictionary.
+        :rtype: Dict[str, (str, bool)]
+        """
+        series_ids = list(series_ids)
+        result = {}
+        cur = self.con.cursor()
+        for start in range(0, len(series_ids), 500):
+            block = series_ids[start:start + 500]
+            cur.execute("SELECT s.series_id, s.last_updated, EXISTS (SELECT 1 FROM observables o WHERE o.series_id = "
+                        "s.series_id) FROM series s WHERE s.series_id IN (" + ",".join("?" * len(block)) + ");",
+                        [str(series_id) for series_id in block])
+            for row in cur.fetchall():
+                result[row[0]] = (row[1], bool(row[2]))
+        return result
+
     def is_empty_series(self, series: Series) -> bool:
         """
         This method check if no observables are saved in the database for a specific :class:`Series`.
@@ -606,9 +995,95 @@ class Database(DataManager):
         """
         if self.is_new_series(series) or force:
             self.delete_series(series)
+            # foreign keys are not enforced by sqlite connections, so observables are not deleted in cascade
+            self._push("DELETE FROM observables WHERE series_id='" + str(series.series_id) + "';")
+        self.delete_derived_series(series.series_id)
         self.insert_series(series)
-        for obs in observables:
-            self.insert_observables(obs)
+        self.insert_observables_many(observables)
+
+    def get_derived_series(self, series_id: str, transform: str, parameters: str, last_updated: str):
+        """
+        This method fetches a derived series (the result of a transformation of a series) saved with :py:meth:`insert_derived_series`.
+        The derived series is returned only if it was computed from the version of the source series identified by last_updated.
+
+        :param series_id: The series identifier of the source series
+        :type series_id: str
+        :param transform: The name of the transformation
+        :type transform: str
+        :param parameters: The parameters of the transformation
+        :type parameters: str
+        :param last_updated: The last_updated value of the source series
+        :type last_updated: str
+        :return: Two numpy arrays (dates and values) or None if no up-to-date derived series is saved
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        cur = self.con.cursor()
+        cur.execute("SELECT last_updated, dates, vals FROM derived_series WHERE derived_id = ?;",
+                    (_derived_id(series_id, transform, parameters),))
+        row = cur.fetchone()
+        if row is None or row[0] != str(last_updated):
+            return None
+        return np.frombuffer(row[1], dtype=np.int64).astype("datetime64[D]"), np.frombuffer(row[2], dtype=np.float64)
+
+    def get_derived_states(self, series_id: str) -> List[Any]:
+        """
+        This method fetches all the derived series of a series that were saved with a running state, whatever version of the source series they were computed from.
+
+        :param series_id: The series identifier of the source series
+        :type series_id: str
+        :return: A list of tuples (transform, parameters, dates, values, state), where state is the saved dictionary
+        :rtype: List[Any]
+        """
+        cur = self.con.cursor()
+        cur.execute("SELECT transform, parameters, dates, vals, state FROM derived_series "
+                    "WHERE series_id = ? AND state IS NOT NULL;", (str(series_id),))
+        return [(row[0], row[1], np.frombuffer(row[2], dtype=np.int64).astype("datetime64[D]"),
+                 np.frombuffer(row[3], dtype=np.float64), json.loads(row[4])) for row in cur.fetchall()]
+
+    def insert_derived_series(self, series_id: str, transform: str, parameters: str, last_updated: str, dates, values,
+                              state=None):
+        """
+        This method saves a derived series (the result of a transformation of a series), replacing any previous version.
+        Derived series of a series are deleted by :py:meth:`update_series`.
+        The optional state is what is needed to extend the derived series when new observables are appended to the source series.
+
+        :param series_id: The series identifier of the source series
+        :type series_id: str
+        :param transform: The name of the transformation
+        :type transform: str
+        :param parameters: The parameters of the transformation
+        :type parameters: str
+        :param last_updated: The last_updated value of the source series
+        :type last_updated: str
+        :param dates: The dates of the derived series
+        :type dates: np.ndarray
+        :param values: The values of the derived series
+        :type values: np.ndarray
+        :param state: A json serializable dictionary, defaults to None
+        :type state: dict
+        :raises DatabaseWritingError: Raised when the writing operation generates an error into the database
+        """
+        statement = "INSERT OR REPLACE INTO derived_series VALUES (?, ?, ?, ?, ?, ?, ?, ?);"
+        cur = self.con.cursor()
+        try:
+            cur.execute(statement, (_derived_id(series_id, transform, parameters), str(series_id), str(transform),
+                                    str(parameters), str(last_updated),
+                                    np.ascontiguousarray(dates, dtype="datetime64[D]").astype(np.int64).tobytes(),
+                                    np.ascontiguousarray(values, dtype=np.float64).tobytes(),
+                                    None if state is None else json.dumps(state)))
+            self.con.commit()
+        except sqlite3.Error as e:
+            raise DatabaseWritingError(statement, e.args[0])
+
+    def delete_derived_series(self, series_id: str):
+        """
+        This method deletes all the derived series computed from a series.
+
+        :param series_id: The series identifier of the source series
+        :type series_id: str
+        """
+        statement = "DELETE FROM derived_series WHERE series_id='" + str(series_id) + "';"
+        self._push(statement)
 
     def _get_single_series(self, series_id: str) -> Series:
         """
@@ -629,4 +1104,63 @@ class Database(DataManager):
             raise SeriesNotFound(series_id)
 
     def __del__(self):
-        self.destroy()
+        try:
+            self.destroy()
+        except sqlite3.ProgrammingError:
+            # the connection was opened by another thread (see DatabasePool), the process closes it when exiting
+            pass
+
+
+class DatabasePool:
+    """
+    ..autoclass::DatabasePool
+
+    This class keeps one open :class:`Database` for each thread (and process) that uses a database, so that
+    connections and schema checks are not repeated at each operation.
+    SQLite connections cannot be shared across threads, hence the pool never hands the same connection to two threads.
+    The connection of a thread is only referenced by the thread itself, so it is closed when the thread ends.
+    """
+
+    def __init__(self, db_name: str):
+        """
+
+        :param db_name: Name of the database to interact with. If it does not exist, then it will be created when first used.
+        :type db_name: str
+        """
+        self.db_name = db_name
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # weak references: the pool must not keep alive the connections of the threads that have ended
+        self._databases = weakref.WeakSet()
+
+    def get(self) -> Database:
+        """
+        This method returns the :class:`Database` of the calling thread, opening it the first time.
+
+        :return: An open connection to the database
+        :rtype: Database
+        """
+        database = getattr(self._local, "database", None)
+        # a forked process must not reuse the connections of its parent
+        if database is None or self._local.pid != os.getpid():
+            database = Database(self.db_name)
+            self._local.database = database
+            self._local.pid = os.getpid()
+            with self._lock:
+                self._databases.add(database)
+        return database
+
+    def close(self):
+        """
+        This method closes all the connections opened by the pool.
+        """
+        with self._lock:
+            databases = list(self._databases)
+            self._databases = weakref.WeakSet()
+        for database in databases:
+            try:
+                database.destroy()
+            except sqlite3.ProgrammingError:
+                # opened by another thread, it is closed when that thread releases it
+                continue
+        self._local = threading.local()
@@ -7,8 +7,14 @@ To use an API it is necessary to have an API key which can be obtained by follow
 from _core import *
 import time
 from tree import *
-from typing import List
+from typing import List, Dict, Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from collections import OrderedDict
+import threading
+import os
 import numpy as np
+from datetime import timedelta
 
 
 class InvalidOperation(Exception):
@@ -23,38 +29,56 @@ class InvalidOperation(Exception):
         super().__init__(mex)
 
 
-def get_children_categories_recursive(parent_category: int, api_key) -> List[Category]:
+def get_children_categories_recursive(parent_category: int, api_key, max_workers=8,
+                                      requests_per_minute=None) -> List[Category]:
     """
     This function allows to obtain a list of all the sub-categories given an input category using a recursive approach.
     The function returns a :class:`model.Category` list and if you want to rebuild a tree structure use the :py:func:`from_list_to_tree` function.
+    Each category is listed after all its sub-categories.
 
     This function will always download the data from internet and doesn't save it on a database.
+    The tree is downloaded one level at a time, and the children of all the categories of a level are requested concurrently.
 
     :param parent_category: Category id of the parent category
     :type parent_category: int
     :param api_key: A valid Fred API Key
     :type api_key: str
+    :param max_workers: The maximum number of concurrent requests, defaults to 8
+    :type max_workers: int
+    :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to None (the limit shared by all the requests made with the api key, see :class:`FredClient`)
+    :type requests_per_minute: int
     :raises BadRequestException: This exception is thrown when an error occurs during http communication
     :return: A list of all the sub-categories of parent_category
     :rtype: List[Category]
     """
-    children = Fred(api_key).get_category_children(parent_category)
-    if len(children) == 0:
-        return []
-    else:
-        category_children = []
-        for ch in children:
-            category_children += get_children_categories_recursive(ch.category_id, api_key) + [ch]
-        return category_children
+    fred = _client(api_key)._fred_with_limit(requests_per_minute)
+    children = {}
+    _crawl_categories(fred, [parent_category], max_workers, lambda level, downloaded: children.update(level))
+    # rebuild the order of a depth-first visit listing each category after its sub-categories
+    category_children = []
+    stack = [(category, False) for category in reversed(children[parent_category])]
+    while len(stack) != 0:
+        category, expanded = stack.pop()
+        if expanded:
+            category_children.append(category)
+        else:
+            stack.append((category, True))
+            stack.extend((child, False) for child in reversed(children[category.category_id]))
+    return category_children
 
 
-def get_children_categories_iterative(parent_category_id: int, api_key: str, db_name="fred.db") -> List[Category]:
+def get_children_categories_iterative(parent_category_id: int, api_key: str, db_name="fred.db", max_workers=8,
+                                      requests_per_minute=None) -> List[Category]:
     """
     This function allows to obtain a list of all the sub-categories given an input category using an iterative approach.
     The function returns a :class:`model.Category` list and if you want to rebuild a tree structure use the :py:func:`from_list_to_tree` function.
 
     If the data does not already exist in a database, this may take a long time.
     The function uses local data whenever possible and stores data downloaded via the internet in a database.
+    The tree is downloaded one level at a time: the children of all the categories of a level are requested
+    concurrently, without exceeding the rate limit of FRED's API, and each level is saved in a single transaction.
+    The database records which categories have been crawled: if the download is interrupted, for example by a
+    network error, calling the function again resumes it without downloading the saved categories again.
 
     :param parent_category_id: Category id of the parent category
     :type parent_category_id: int
@@ -62,49 +86,240 @@ def get_children_categories_iterative(parent_category_id: int, api_key: str, db_
     :type api_key: str
     :param db_name: The name of the database you want to use, defaults to fred.db
     :type db_name: str
+    :param max_workers: The maximum number of concurrent requests, defaults to 8
+    :type max_workers: int
+    :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to None (the limit shared by all the requests made with the api key, see :class:`FredClient`)
+    :type requests_per_minute: int
     :raises BadRequestException: This exception is thrown when an error occurs during http communication
     :return: A list of all the sub-categories of parent_category
     :rtype: List[Category]
     """
-    database = Database(db_name)
+    client = _client(api_key, db_name)
+    database = client.database()
+    fred = client._fred_with_limit(requests_per_minute)
     # check if the category already is in the database
     try:
         category = database.get_category(parent_category_id)
-        iterative_list = [category]
-        result_list = []
-        while len(iterative_list) != 0:
-            iterative_list += database.get_categories_by_parent_id(iterative_list[0].category_id)
-            first_element = iterative_list.pop(0)
-            result_list.append(first_element)
-            if first_element.category_id == 0:
-                for item in iterative_list:
-                    if item.category_id == 0:
-                        iterative_list.remove(item)
-                        break
-
     except CategoryNotFound:
         # retrieve the category from FRED
-        fred = Fred(api_key)
         category = fred.get_category(parent_category_id)
-        iterative_list = [category]
-        result_list = []
-        time_sleep = 0.35
-        if parent_category_id == 0:
-            time_sleep = 0.8
-        while len(iterative_list) != 0:
-            iterative_list += fred.get_category_children(iterative_list[0].category_id)
-            time.sleep(time_sleep)
-            result_list.append(iterative_list.pop(0))
-
-        for cat in result_list:
-            try:
-                database.insert_category(cat)
-            except DatabaseWritingError:
-                continue
+        database.insert_categories_many([category])
+    result_list = [category]
+
+    def store_level(level, downloaded):
+        # the downloaded children are saved, and their parents marked as crawled, even if the level is incomplete
+        database.insert_crawled_categories(downloaded)
+        result_list.extend(child for children in level.values() for child in children)
 
+    _crawl_categories(fred, [parent_category_id], max_workers, store_level, database.get_crawled_children)
     return result_list
 
 
+def sync_category_tree(parent_category_id: int, api_key: str, db_name="fred.db", trees=(), max_age=None,
+                       max_checks=None, max_workers=8, requests_per_minute=None) -> CategoryChangeSet:
+    """
+    This function allows you to bring up to date the tree of the sub-categories of a category saved in a database
+    without downloading it again. The stored children list of each crawled category is compared with the one on FRED,
+    shallower categories first and, at the same depth, the ones checked longest ago first. The requests are made
+    concurrently, without exceeding the rate limit of FRED's API.
+
+    Only the differences are written to the database, in a single transaction: the new categories are saved (their own
+    children are downloaded by the next crawl, see :py:func:`get_children_categories_iterative`), the moved categories
+    get their new parent and the removed categories are deleted with their sub-categories.
+    The same changes are applied to the given :class:`tree.CategoryTree` objects.
+
+    :param parent_category_id: Category id of the root of the tree
+    :type parent_category_id: int
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param trees: The loaded trees to update, defaults to none
+    :type trees: List[CategoryTree]
+    :param max_age: The categories checked less than max_age seconds ago are skipped, defaults to None (all the categories are checked)
+    :type max_age: float
+    :param max_checks: The maximum number of categories checked, defaults to None (no limit)
+    :type max_checks: int
+    :param max_workers: The maximum number of concurrent requests, defaults to 8
+    :type max_workers: int
+    :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to None (the limit shared by all the requests made with the api key, see :class:`FredClient`)
+    :type requests_per_minute: int
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication, in that case nothing is changed
+    :raises CategoryNotFound: This exception is thrown if the category is not in the database
+    :return: The changes found
+    :rtype: CategoryChangeSet
+    """
+    client = _client(api_key, db_name)
+    database = client.database()
+    fred = client._fred_with_limit(requests_per_minute)
+    changes = CategoryChangeSet(parent_category_id)
+    # stored tree: category id -> (category, depth) and children lists of the crawled categories
+    stored = {parent_category_id: (database.get_category(parent_category_id), 0)}
+    stored_children = {}
+    frontier = [parent_category_id]
+    depth = 0
+    while len(frontier) != 0:
+        depth += 1
+        level = database.get_crawled_children(frontier)
+        stored_children.update(level)
+        frontier = []
+        for children in level.values():
+            for child in children:
+                stored[child.category_id] = (child, depth)
+                frontier.append(child.category_id)
+    checked = database.get_crawl_checked(stored_children.keys())
+    candidates = sorted(stored_children.keys(), key=lambda category_id: (stored[category_id][1], checked[category_id] or ""))
+    if max_age is not None:
+        limit = (dt.utcnow() - timedelta(seconds=max_age)).strftime("%Y-%m-%d %H:%M:%S")
+        candidates = [category_id for category_id in candidates if checked[category_id] is None or checked[category_id] < limit]
+    if max_checks is not None:
+        candidates = candidates[:max_checks]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        fetched = OrderedDict(zip(candidates, executor.map(lambda category_id: _current_children(fred, category_id),
+                                                           candidates)))
+        gone = set(category_id for category_id, children in fetched.items() if children is None)
+        fetched = OrderedDict((category_id, [child for child in children if child.category_id != category_id])
+                              for category_id, children in fetched.items() if children is not None)
+        for category_id, children in fetched.items():
+            for child in children:
+                if child.category_id not in stored:
+                    changes.added.append(child)
+                elif stored[child.category_id][0].parent_id != category_id:
+                    changes.moved.append((child, stored[child.category_id][0].parent_id))
+        found = set(child.category_id for children in fetched.values() for child in children)
+        missing = [child for category_id in fetched for child in stored_children[category_id]
+                   if child.category_id not in found]
+        # the checked categories that do not exist anymore are removed, even when their parent was not checked
+        missing_ids = set(child.category_id for child in missing)
+        missing.extend(stored[category_id][0] for category_id in gone if category_id not in missing_ids)
+        # a category missing from the list of its parent was either removed or moved under a category not checked:
+        # the top-most ones are resolved first, the descendants of a removed category are removed with it
+        missing.sort(key=lambda child: stored[child.category_id][1])
+        moved_ids = set(category.category_id for category, old_parent_id in changes.moved)
+        removed = OrderedDict()
+        start = 0
+        while start < len(missing):
+            end = start
+            while end < len(missing) and stored[missing[end].category_id][1] == stored[missing[start].category_id][1]:
+                end += 1
+            level = [child for child in missing[start:end]
+                     if not _has_stored_ancestor(child, removed, stored, parent_category_id)]
+            parents = executor.map(lambda child: None if child.category_id in gone
+                                   else _current_parent(fred, child.category_id), level)
+            for child, parent_id in zip(level, parents):
+                if parent_id is not None:
+                    changes.moved.append((Category(child.category_id, child.name, parent_id), child.parent_id))
+                    moved_ids.add(child.category_id)
+                else:
+                    for category in _stored_subtree(child, stored_children, moved_ids):
+                        removed[category.category_id] = category
+            start = end
+    changes.removed = list(removed.values())
+    changes.checked = len(fetched) + len(gone)
+    # nothing is written back for the removed categories, or for categories listed under them
+    fetched = OrderedDict((category_id, children) for category_id, children in fetched.items()
+                          if category_id not in removed)
+    changes.added = [category for category in changes.added if category.parent_id not in removed]
+    changes.moved = [(category, old_parent_id) for category, old_parent_id in changes.moved
+                     if category.parent_id not in removed]
+    database.apply_category_changes(fetched, [category for category, old_parent_id in changes.moved],
+                                    [category.category_id for category in changes.removed])
+    for tree in trees:
+        tree.apply_changes(changes)
+    return changes
+
+
+def _current_parent(fred: Fred, category_id: int):
+    """
+    Private function. Returns the id of the current parent of a category on FRED, None if the category does not exist anymore.
+    """
+    try:
+        return fred.get_category(category_id).parent_id
+    except CategoryNotFound:
+        return None
+    except BadRequestException as e:
+        # FRED answers 400 for the ids of the categories that do not exist
+        if e.status_code == 400:
+            return None
+        raise
+
+
+def _current_children(fred: Fred, category_id: int):
+    """
+    Private function. Returns the children of a category on FRED, None if the category does not exist anymore.
+    """
+    try:
+        return fred.get_category_children(category_id)
+    except BadRequestException as e:
+        # FRED answers 400 for the ids of the categories that do not exist
+        if e.status_code == 400:
+            return None
+        raise
+
+
+def _stored_subtree(category: Category, stored_children, moved_ids) -> List[Category]:
+    """
+    Private function. Returns a stored category and its stored descendants, except the moved ones and their subtrees.
+    """
+    result = []
+    stack = [category]
+    while len(stack) != 0:
+        category = stack.pop()
+        result.append(category)
+        stack.extend(child for child in stored_children.get(category.category_id, [])
+                     if child.category_id not in moved_ids)
+    return result
+
+
+def _has_stored_ancestor(category: Category, ancestors, stored, root_id) -> bool:
+    """
+    Private function. Checks if one of the stored ancestors of a category, below the root of the tree, is in ancestors.
+    """
+    parent_id = category.parent_id
+    while parent_id != root_id and parent_id in stored:
+        if parent_id in ancestors:
+            return True
+        parent_id = stored[parent_id][0].parent_id
+    return False
+
+
+def _crawl_categories(fred: Fred, category_ids: List[int], max_workers: int, on_level, known_children=None):
+    """
+    Private function. Visits the sub-categories of the given categories one level at a time: the children of all the
+    categories of a level are requested concurrently, except the ones returned by known_children (a function mapping a
+    list of category ids to a dictionary of the known children lists). on_level is called in the calling thread with
+    a dictionary mapping the category ids of each level to their children (in the order of the level) and a dictionary
+    of the downloaded children lists only, before the next level is visited. If some requests fail, on_level receives
+    the rest of the level before the first error is raised.
+    """
+    frontier = list(category_ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while len(frontier) != 0:
+            known = {} if known_children is None else known_children(frontier)
+            futures = {category_id: executor.submit(fred.get_category_children, category_id)
+                       for category_id in frontier if category_id not in known}
+            level = OrderedDict()
+            downloaded = OrderedDict()
+            errors = []
+            for category_id in frontier:
+                if category_id in known:
+                    children = known[category_id]
+                else:
+                    try:
+                        children = futures[category_id].result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                # the root category of FRED is its own parent
+                level[category_id] = [child for child in children if child.category_id != category_id]
+                if category_id in futures:
+                    downloaded[category_id] = level[category_id]
+            on_level(level, downloaded)
+            if len(errors) != 0:
+                raise errors[0]
+            frontier = [child.category_id for children in level.values() for child in children]
+
+
 def get_series(category_id: int, api_key: str, db_name="fred.db") -> List[Series]:
     """
     This function allows you to obtain all the :class:`model.Series` associated with a certain category as input.
@@ -120,14 +335,18 @@ def get_series(category_id: int, api_key: str, db_name="fred.db") -> List[Series
     :return: A list of all the series associated with the given category id
     :rtype: List[Series]
     """
-    database = Database(db_name)
-    fred = Fred(api_key)
+    client = _client(api_key, db_name)
+    series = client._series_cache.get(category_id)
+    if series is not None:
+        return list(series)
+    database = client.database()
     series = database.get_series(category_id)
     if len(series) == 0:
-        series = fred.get_series(category_id)
+        series = client.fred.get_series(category_id)
         for ser in series:
             database.insert_series(ser)
-    return series
+    client._series_cache.put(category_id, series)
+    return list(series)
 
 
 def update_series(series_id: str, api_key: str, db_name="fred.db", force=False) -> bool:
@@ -147,16 +366,39 @@ def update_series(series_id: str, api_key: str, db_name="fred.db", force=False)
     :return: The function returns a boolean which is true if the series has been updated, false otherwise. Note that if the local data is already updated the function will return false
     :rtype: bool
     """
-    fred = Fred(api_key)
-    database = Database(db_name)
+    # Derived series cached by moving_average, prime_differences, prime_differences_percent and linear_regression are
+    # extended with the new observables only, unless any stored observable was revised or force is set
+    client = _client(api_key, db_name)
+    fred = client.fred
+    database = client.database()
     series = fred.get_single_series(series_id)
     if database.is_new_series(series) or force:
         obs = fred.get_observables(series.series_id)
-        database.update_series(series, obs, force)
+        _store_series_update(client, series, obs, force)
         return True
     return False
 
 
+def _store_series_update(client, series: Series, observables: List[Observable], force: bool):
+    """
+    Private function. Saves the new version of a series, extends its cached derived series and drops the data of the
+    series from the in-memory caches of the client.
+    """
+    database = client.database()
+    client._forget_series(series.series_id)
+    dates, values = _observables_to_arrays(observables)
+    derived = [] if force else database.get_derived_states(series.series_id)
+    if len(derived) != 0:
+        # the derived series can only be extended if the stored observables are an unrevised prefix of the new ones
+        stored_dates, stored_values = database.get_observable_arrays(series.series_id)
+        size = len(stored_dates)
+        if size > len(dates) or not np.array_equal(stored_dates, dates[:size]) or \
+                not np.array_equal(stored_values, values[:size], equal_nan=True):
+            derived = []
+    database.update_series(series, observables, force)
+    _extend_derived_series(database, series, derived, dates, values)
+
+
 def get_observables(series_id: str, api_key: str, db_name="fred.db") -> List[Observable]:
     """
     This function allows you to get all the :class:`model.Observable` given the id of a :class:`Series`.
@@ -172,25 +414,74 @@ def get_observables(series_id: str, api_key: str, db_name="fred.db") -> List[Obs
     :return: A list of all the observables linked with the given series id
     :rtype: List[Observable]
     """
-    fred = Fred(api_key)
-    database = Database(db_name)
+    client = _client(api_key, db_name)
+    fred = client.fred
+    database = client.database()
     try:
         series = database._get_single_series(series_id)
         if database.is_empty_series(series):
             observables = fred.get_observables(series_id)
-            for obs in observables:
-                database.insert_observables(obs)
+            database.insert_observables_many(observables)
             result = observables
         else:
             result = database.get_observables(series_id)
     except SeriesNotFound:
         observables = fred.get_observables(series_id)
-        for obs in observables:
-            database.insert_observables(obs)
+        database.insert_observables_many(observables)
         result = observables
     return result
 
 
+def get_observables_many(series_ids: List[str], api_key: str, db_name="fred.db", max_workers=8,
+                         requests_per_minute=None, batch_size=50) -> Dict[str, List[Observable]]:
+    """
+    This function allows you to get all the :class:`model.Observable` of many series at once, as :py:func:`get_observables` does for a single series.
+    Local data are read with a few bulk queries; the series that are not in the database are downloaded concurrently, without exceeding the rate limit of FRED's API, and saved in batched transactions.
+
+    :param series_ids: Identifiers of the series from which you want to get the data
+    :type series_ids: List[str]
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param max_workers: The maximum number of concurrent downloads, defaults to 8
+    :type max_workers: int
+    :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to None (the limit shared by all the requests made with the api key, see :class:`FredClient`)
+    :type requests_per_minute: int
+    :param batch_size: The number of downloaded series saved in each transaction, defaults to 50
+    :type batch_size: int
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication. It is raised after all the other downloads have been completed and saved
+    :return: A dictionary mapping each series id to the list of its observables
+    :rtype: Dict[str, List[Observable]]
+    """
+    client = _client(api_key, db_name)
+    database = client.database()
+    result = database.get_observables_many(series_ids)
+    misses = [series_id for series_id in dict.fromkeys(series_ids) if series_id not in result]
+    fred = client._fred_with_limit(requests_per_minute)
+    errors = []
+    pending = []
+    pending_series = 0
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fred.get_observables, series_id): series_id for series_id in misses}
+        for future in as_completed(futures):
+            try:
+                result[futures[future]] = future.result()
+            except Exception as e:
+                errors.append(e)
+                continue
+            pending.extend(result[futures[future]])
+            pending_series += 1
+            if pending_series == batch_size:
+                database.insert_observables_many(pending)
+                pending = []
+                pending_series = 0
+    database.insert_observables_many(pending)
+    if len(errors) > 0:
+        raise errors[0]
+    return {series_id: result[series_id] for series_id in series_ids}
+
+
 def update_category(category_id: int, api_key: str, db_name="fred.db", force=False) -> bool:
     """
     This function allows you to update all the :class:`model.Series` linked to a given category.
@@ -208,14 +499,116 @@ def update_category(category_id: int, api_key: str, db_name="fred.db", force=Fal
     :return: The function returns a boolean which is true if all the series has been updated, false otherwise. Note that if one of the local data is already updated the function will return false
     :rtype: bool
     """
-    fred = Fred(api_key)
-    series = fred.get_series(category_id)
+    series = _client(api_key, db_name).fred.get_series(category_id)
     result = True
     for ser in series:
-        result = result and update_series(ser.series_id, api_key, db_name=db_name, force=force)
+        result = update_series(ser.series_id, api_key, db_name=db_name, force=force) and result
     return result
 
 
+class CategoryUpdateReport:
+    """
+    This class represents the outcome of :py:func:`refresh_category`.
+
+    The updated and skipped attributes are lists of series ids, failed is a dictionary mapping series ids to the
+    exception raised while updating them, durations maps the id of each updated or failed series to the seconds spent
+    on it and elapsed is the total duration of the refresh in seconds.
+    """
+
+    def __init__(self, category_id):
+        """
+
+        :param category_id: The id of the refreshed category
+        :type category_id: int
+        """
+        self.category_id = category_id
+        self.updated = []
+        self.skipped = []
+        self.failed = {}
+        self.durations = {}
+        self.elapsed = 0.0
+
+    def __str__(self):
+        return "Category ID-> " + str(self.category_id) + " Updated-> " + str(len(self.updated)) + " Skipped-> " + str(
+            len(self.skipped)) + " Failed-> " + str(len(self.failed)) + " Elapsed-> " + str(round(self.elapsed, 3)) + "s"
+
+
+def _is_stale(series: Series, freshness) -> bool:
+    """
+    Private function. Same check as :py:meth:`Database.is_new_series`, on the values of :py:meth:`Database.get_freshness_many`.
+    """
+    if freshness is None:
+        return True
+    last_updated, has_observables = freshness
+    return series.last_updated.split(" ")[0] > last_updated.split(" ")[0] or not has_observables
+
+
+def _timed_observables(fred: Fred, series_id: str):
+    """
+    Private function. Downloads the observables of a series and measures the time spent.
+    Returns the observables (None if the download failed), the seconds spent and the error raised (None if any).
+    """
+    start = time.perf_counter()
+    try:
+        return fred.get_observables(series_id), time.perf_counter() - start, None
+    except Exception as e:
+        return None, time.perf_counter() - start, e
+
+
+def refresh_category(category_id: int, api_key: str, db_name="fred.db", force=False, max_workers=8,
+                     requests_per_minute=None) -> CategoryUpdateReport:
+    """
+    This function allows you to update all the :class:`model.Series` linked to a given category, as :py:func:`update_category` does, but concurrently.
+    The metadata of the series are downloaded with a single request and compared with the local data with a single query: only the series that are not up-to-date are downloaded again.
+    Downloads run concurrently, without exceeding the rate limit of FRED's API, and an error on a series does not stop the others.
+
+    :param category_id: id of the category from which you want to update the series
+    :type category_id: int
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param force: A Boolean flag. Set this flag to true if you want to force the API to re-download the content from Fred
+    :type force: bool
+    :param max_workers: The maximum number of concurrent downloads, defaults to 8
+    :type max_workers: int
+    :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to None (the limit shared by all the requests made with the api key, see :class:`FredClient`)
+    :type requests_per_minute: int
+    :raises BadRequestException: This exception is thrown when an error occurs while downloading the list of series of the category
+    :return: A report of the updated, skipped and failed series
+    :rtype: CategoryUpdateReport
+    """
+    start = time.perf_counter()
+    report = CategoryUpdateReport(category_id)
+    client = _client(api_key, db_name)
+    fred = client._fred_with_limit(requests_per_minute)
+    database = client.database()
+    series = fred.get_series(category_id)
+    freshness = database.get_freshness_many(ser.series_id for ser in series)
+    stale = []
+    for ser in series:
+        if force or _is_stale(ser, freshness.get(ser.series_id)):
+            stale.append(ser)
+        else:
+            report.skipped.append(ser.series_id)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_timed_observables, fred, ser.series_id): ser for ser in stale}
+        for future in as_completed(futures):
+            ser = futures[future]
+            observables, duration, error = future.result()
+            if error is None:
+                try:
+                    _store_series_update(client, ser, observables, force)
+                    report.updated.append(ser.series_id)
+                except Exception as e:
+                    error = e
+            if error is not None:
+                report.failed[ser.series_id] = error
+            report.durations[ser.series_id] = duration
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
 def from_list_to_tree(list_of_categories) -> CategoryTree:
     """
     This function allows you to convert a list of :class:`model.Category` into a :class:`model.CategoryTree` in order to manage access to categories with a tree structure.
@@ -229,11 +622,135 @@ def from_list_to_tree(list_of_categories) -> CategoryTree:
     return CategoryTree(list_of_categories)
 
 
+def search_categories(text: str, api_key: str, db_name="fred.db", limit=20, prefix=True) -> List[Category]:
+    """
+    This function allows you to search the :class:`model.Category` whose name contains all the words of a text, best matches first.
+    Only the categories saved in the database are searched: the index is updated every time a category is saved.
+
+    :param text: The words to search
+    :type text: str
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param limit: The maximum number of categories returned, defaults to 20
+    :type limit: int
+    :param prefix: If true, each word also matches the words starting with it, so that the function can be used while the user is typing, defaults to True
+    :type prefix: bool
+    :raises NotSupportedOperation: This exception is thrown if the SQLite library does not support full-text search (FTS5)
+    :return: A list of the matching categories
+    :rtype: List[Category]
+    """
+    return _client(api_key, db_name).database().search_categories(text, limit, prefix)
+
+
+def search_series(text: str, api_key: str, db_name="fred.db", limit=20, prefix=True) -> List[Series]:
+    """
+    This function allows you to search the :class:`model.Series` whose title contains all the words of a text, best matches first.
+    Only the series saved in the database are searched: the index is updated every time a series is saved.
+
+    :param text: The words to search
+    :type text: str
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param limit: The maximum number of series returned, defaults to 20
+    :type limit: int
+    :param prefix: If true, each word also matches the words starting with it, so that the function can be used while the user is typing, defaults to True
+    :type prefix: bool
+    :raises NotSupportedOperation: This exception is thrown if the SQLite library does not support full-text search (FTS5)
+    :return: A list of the matching series
+    :rtype: List[Series]
+    """
+    return _client(api_key, db_name).database().search_series(text, limit, prefix)
+
+
+def get_category_tree(parent_category_id: int, api_key: str, db_name="fred.db", snapshot_file=None) -> CategoryTree:
+    """
+    This function allows to obtain the :class:`tree.CategoryTree` of all the sub-categories of a category, as :py:func:`get_children_categories_iterative` followed by :py:func:`from_list_to_tree` does.
+    If a snapshot file is given, the tree is loaded from it when it is still consistent with the categories saved in the database; otherwise the tree is built and saved in the snapshot file, so that the next call is almost instantaneous.
+
+    :param parent_category_id: Category id of the root of the tree
+    :type parent_category_id: int
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param snapshot_file: The name of the snapshot file, defaults to None (no snapshot is used)
+    :type snapshot_file: str
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :return: The tree of the sub-categories of the category
+    :rtype: CategoryTree
+    """
+    database = _client(api_key, db_name).database()
+    if snapshot_file is not None and os.path.exists(snapshot_file):
+        try:
+            tree = CategoryTree.load_snapshot(snapshot_file, database.get_categories_version())
+            if tree.root.key == parent_category_id:
+                return tree
+        except InvalidSnapshot:
+            pass
+    tree = from_list_to_tree(get_children_categories_iterative(parent_category_id, api_key, db_name))
+    if snapshot_file is not None:
+        tree.save_snapshot(snapshot_file, database.get_categories_version())
+    return tree
+
+
+def get_lazy_category_tree(parent_category_id: int, api_key: str, db_name="fred.db", prefetch=0,
+                           max_workers=8) -> LazyCategoryTree:
+    """
+    This function allows you to browse the tree of the sub-categories of a category without downloading it first.
+    The function returns a :class:`tree.LazyCategoryTree` whose children are loaded on first access: from the database
+    if possible, otherwise from FRED, storing the downloaded categories in the database.
+
+    :param parent_category_id: Category id of the root of the tree
+    :type parent_category_id: int
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param prefetch: The number of levels loaded immediately, concurrently, defaults to 0
+    :type prefetch: int
+    :param max_workers: The maximum number of categories loaded concurrently, defaults to 8
+    :type max_workers: int
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :raises CategoryNotFound: This exception is thrown if the category does not exist
+    :return: The lazy tree rooted at the given category
+    :rtype: LazyCategoryTree
+    """
+    client = _client(api_key, db_name)
+    try:
+        root = client.database().get_category(parent_category_id)
+    except CategoryNotFound:
+        root = client.fred.get_category(parent_category_id)
+        client.database().insert_categories_many([root])
+    lazy_tree = LazyCategoryTree(root, lambda category_id: _load_children(client, category_id), max_workers)
+    if prefetch > 0:
+        lazy_tree.prefetch(levels=prefetch)
+    return lazy_tree
+
+
+def _load_children(client, category_id: int) -> List[Category]:
+    """
+    Private function. Returns the children of a category from the database, downloading and storing them if they
+    have not been crawled yet. It can be called from any thread.
+    """
+    database = client.database()
+    children = database.get_crawled_children([category_id]).get(category_id)
+    if children is None:
+        # the root category of FRED is its own parent
+        children = [child for child in client.fred.get_category_children(category_id) if child.category_id != category_id]
+        database.insert_crawled_categories({category_id: children})
+    return children
+
+
 def moving_average(series: Series, n: int, api_key, db_name="fred.db") -> List[Observable]:
     """
     This function compute the moving average from a given series.
     The function uses local data if possible and saves all data downloaded via the internet to a database.
     The function returns a list of :class:`model.Observable` modified with the moving average application.
+    Results are cached in the database and, when the series is updated (see :py:func:`update_series`), only extended with the new observables.
 
     :param series: The series on which you want to calculate the moving average
     :type series: Series
@@ -248,15 +765,7 @@ def moving_average(series: Series, n: int, api_key, db_name="fred.db") -> List[O
     :return: A list of observables modified with the moving average
     :rtype: List[Observable]
     """
-    values = get_observables(series.series_id, api_key, db_name)
-    if n > len(values):
-        raise InvalidOperation("You want to compute a moving average on a period of: "+str(n)+" but the series has only "+ str(len(values))+" values")
-    for i in range(0, len(values) - n + 1):
-        mean = 0
-        for j in range(0, n):
-            mean += values[i + j].value
-        values[i].value = mean / n
-    return values[:len(values) - n + 1]
+    return _arrays_to_observables(*_derived_arrays(series, "moving_average", (n,), api_key, db_name), series.series_id)
 
 
 def prime_differences(series: Series, api_key, db_name="fred.db") -> List[Observable]:
@@ -264,6 +773,7 @@ def prime_differences(series: Series, api_key, db_name="fred.db") -> List[Observ
     This function returns the prime differences :class:`model.Series` given an input series.
     The function uses local data if possible and saves all data downloaded via the internet to a database.
     The function returns a list of :class:`model.Observable` modified with the prime differences application.
+    Results are cached in the database and, when the series is updated (see :py:func:`update_series`), only extended with the new observables.
 
     :param series: The series on which you want to calculate the prime differences
     :type series: Series
@@ -276,10 +786,7 @@ def prime_differences(series: Series, api_key, db_name="fred.db") -> List[Observ
     :rtype: List[Observable]
 
     """
-    values = get_observables(series.series_id, api_key, db_name)
-    for i in range(1, len(values)):
-        values[i - 1].value = values[i].value - values[i - 1].value
-    return values[:len(values) - 1]
+    return _arrays_to_observables(*_derived_arrays(series, "prime_differences", (), api_key, db_name), series.series_id)
 
 
 def prime_differences_percent(series: Series, api_key, db_name="fred.db") -> List[Observable]:
@@ -287,6 +794,7 @@ def prime_differences_percent(series: Series, api_key, db_name="fred.db") -> Lis
     This function returns the prime percentage differences :class:`model.Series` given an input :class:`model.Series`.
     The function uses local data if possible and saves all data downloaded via the internet to a database.
     The function returns a list of :class:`model.Observable` modified with the prime percentage differences application.
+    Results are cached in the database and, when the series is updated (see :py:func:`update_series`), only extended with the new observables.
 
     :param series: The series on which you want to calculate the prime percentage differences
     :type series: Series
@@ -299,15 +807,170 @@ def prime_differences_percent(series: Series, api_key, db_name="fred.db") -> Lis
     :rtype: List[Observable]
 
     """
-    values = get_observables(series.series_id, api_key, db_name)
-    for i in range(1, len(values)):
-        prime_diff = values[i].value - values[i - 1].value
-        if values[i - 1].value != 0:
-            values[i - 1].value = prime_diff / values[i - 1].value
-        else:
-            values[i - 1].value = float("NaN")
+    return _arrays_to_observables(*_derived_arrays(series, "prime_differences_percent", (), api_key, db_name),
+                                  series.series_id)
+
+
+def _rolling_mean_inplace(buffer: np.ndarray, size: int, n: int) -> int:
+    """
+    Private function. Replaces the first size values of buffer with their moving average on a period of n, each mean
+    being stored at the position of the first value of its window. Returns the new number of values.
+    """
+    if n < 1 or n > size:
+        raise InvalidOperation("You want to compute a moving average on a period of: " + str(
+            n) + " but the series has only " + str(size) + " values")
+    # a missing value only makes the windows containing it missing
+    missing = np.isnan(buffer[:size])
+    counts = np.cumsum(missing)
+    sums = np.cumsum(np.where(missing, 0, buffer[:size]))
+    buffer[1:size - n + 1] = sums[n:] - sums[:size - n]
+    buffer[0] = sums[n - 1]
+    window_missing = np.empty(size - n + 1, dtype=bool)
+    window_missing[1:] = counts[n:] != counts[:size - n]
+    window_missing[0] = counts[n - 1] != 0
+    size -= n - 1
+    buffer[:size] /= n
+    buffer[:size][window_missing] = np.nan
+    return size
+
+
+def _diff_inplace(buffer: np.ndarray, size: int, order=1) -> int:
+    """
+    Private function. Replaces the first size values of buffer with their prime differences of the given order, each
+    difference being stored at the position of its first value. Returns the new number of values.
+    """
+    order = min(order, size)
+    if order > 0:
+        buffer[:size - order] = np.diff(buffer[:size], n=order)
+    return size - order
+
+
+def _pct_inplace(buffer: np.ndarray, size: int) -> int:
+    """
+    Private function. Replaces the first size values of buffer with their prime percentage differences (NaN where the
+    previous value is zero), each stored at the position of its first value. Returns the new number of values.
+    """
+    if size == 0:
+        return 0
+    previous = buffer[:size - 1]
+    zeros = previous == 0
+    np.divide(buffer[1:size] - previous, previous, out=previous, where=~zeros)
+    previous[zeros] = np.nan
+    return size - 1
+
+
+def _arrays_to_observables(dates: np.ndarray, values: np.ndarray, series_id) -> List[Observable]:
+    """
+    Private function. Converts two numpy arrays (dates and values) into a list of observables.
+    """
+    return [Observable(str(date), value, series_id) for date, value in zip(dates, values.tolist())]
+
 
-    return values[:len(values) - 1]
+_derived_kernels = {"moving_average": _rolling_mean_inplace, "prime_differences": _diff_inplace,
+                    "prime_differences_percent": _pct_inplace}
+
+
+def _regression_sums(days: np.ndarray, values: np.ndarray, origin: int) -> np.ndarray:
+    """
+    Private function. Returns the sufficient statistics n, sum(x), sum(y), sum(xy), sum(x^2) of a regression on time,
+    with x the epochday shifted by origin to limit cancellation errors.
+    """
+    x = (days - origin).astype(np.float64)
+    return np.array([len(x), x.sum(), values.sum(), x @ values, x @ x])
+
+
+def _compute_derived(transform: str, args, dates: np.ndarray, values: np.ndarray):
+    """
+    Private function. Computes a derived series from the whole source series.
+    Returns its dates, its values and the running state used by :py:func:`_extend_derived` to extend it.
+    """
+    state = {"args": list(args), "last_date": str(dates[-1]) if len(dates) > 0 else None,
+             "last_value": float(values[-1]) if len(values) > 0 else None}
+    if transform == "linear_regression":
+        days = dates.astype(np.int64)
+        coefficients, _, _ = _least_squares(_design_matrix([days]), values)
+        state["tail_dates"], state["tail_values"] = [], []
+        state["origin"] = int(days[0])
+        state["sums"] = _regression_sums(days, values, state["origin"]).tolist()
+        return dates[len(dates) - 1:], coefficients, state
+    buffer = np.array(values, dtype=np.float64)
+    size = _derived_kernels[transform](buffer, len(buffer), *args)
+    # the last observables that did not produce a result yet are needed to extend the derived series
+    tail = len(values) - size
+    state["tail_dates"] = [str(date) for date in dates[len(dates) - tail:]]
+    state["tail_values"] = values[len(values) - tail:].tolist()
+    return dates[:size], buffer[:size], state
+
+
+def _extend_derived(transform: str, derived_dates: np.ndarray, derived_values: np.ndarray, state, dates: np.ndarray,
+                    values: np.ndarray):
+    """
+    Private function. Extends a derived series computed by :py:func:`_compute_derived` with the observables of the
+    new version of the source series that follow the last date of the old version, in O(new observables).
+    Returns None if the observables the state relies on were revised, in which case the derived series must be
+    recomputed.
+    """
+    tail_dates = np.array(state["tail_dates"] + ([state["last_date"]] if state["last_date"] is not None else []),
+                          dtype="datetime64[D]")
+    tail_values = np.array(state["tail_values"] + ([state["last_value"]] if state["last_value"] is not None else []))
+    positions = np.searchsorted(dates, tail_dates)
+    if np.any(positions >= len(dates)) or np.any(dates[np.minimum(positions, len(dates) - 1)] != tail_dates) or \
+            np.any(values[np.minimum(positions, len(values) - 1)] != tail_values):
+        return None
+    start = positions[-1] + 1 if len(positions) > 0 else 0
+    if start == len(dates):
+        return derived_dates, derived_values, state
+    new_dates = dates[start:]
+    new_values = values[start:]
+    if transform == "linear_regression":
+        sums = np.array(state["sums"]) + _regression_sums(new_dates.astype(np.int64), new_values, state["origin"])
+        n, sum_x, sum_y, sum_xy, sum_xx = sums
+        b1 = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+        b0 = (sum_y - b1 * sum_x) / n - b1 * state["origin"]
+        state = dict(state, sums=sums.tolist(), last_date=str(dates[-1]), last_value=float(values[-1]))
+        return dates[len(dates) - 1:], np.array([b0, b1]), state
+    extended_dates, extended_values, state = _compute_derived(
+        transform, state["args"], np.concatenate((np.array(state["tail_dates"], dtype="datetime64[D]"), new_dates)),
+        np.concatenate((np.array(state["tail_values"]), new_values)))
+    return np.concatenate((derived_dates, extended_dates)), np.concatenate((derived_values, extended_values)), state
+
+
+def _extend_derived_series(database: Database, series: Series, derived, dates: np.ndarray, values: np.ndarray):
+    """
+    Private function. Saves the extension of the derived series of a series (as returned by
+    :py:meth:`Database.get_derived_states` before the update) for the new version of the series.
+    """
+    for transform, parameters, derived_dates, derived_values, state in derived:
+        try:
+            extended = _extend_derived(transform, derived_dates, derived_values, state, dates, values)
+        except InvalidOperation:
+            extended = None
+        if extended is not None:
+            database.insert_derived_series(series.series_id, transform, parameters, series.last_updated, *extended)
+
+
+def _derived_arrays(series: Series, transform: str, args, api_key, db_name) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Returns the dates and the values of a derived series of a series.
+    The result is cached in the database, keyed on the transformation, its arguments and the last_updated value of
+    the series, so it is only recomputed when the series changes. Series not saved in the database are not cached.
+    """
+    parameters = ",".join(str(arg) for arg in args)
+    database = _client(api_key, db_name).database()
+    try:
+        last_updated = database._get_single_series(series.series_id).last_updated
+        derived = database.get_derived_series(series.series_id, transform, parameters, last_updated)
+    except SeriesNotFound:
+        last_updated = None
+        derived = None
+    if derived is None:
+        dates, values = _get_observable_arrays(series.series_id, api_key, db_name)
+        derived_dates, derived_values, state = _compute_derived(transform, args, dates, values)
+        derived = derived_dates, derived_values
+        if last_updated is not None:
+            database.insert_derived_series(series.series_id, transform, parameters, last_updated, derived_dates,
+                                           derived_values, state)
+    return derived
 
 
 def compute_covariance(series1: Series, series2: Series, api_key, db_name="fred.db") -> np.ndarray:
@@ -332,26 +995,141 @@ def compute_covariance(series1: Series, series2: Series, api_key, db_name="fred.
     observables1 = get_observables(series1.series_id, api_key, db_name)
     observables2 = get_observables(series2.series_id, api_key, db_name)
     if len(observables2) == len(observables1):
-        values = []
-        for i in range(0, len(observables1)):
-            values.append(observables1[i].value)
-        values1 = np.array(values)
-        values = []
-        for i in range(0, len(observables2)):
-            values.append(observables2[i].value)
-        values2 = np.array(values)
+        values1 = np.fromiter((obs.value for obs in observables1), dtype=np.float64, count=len(observables1))
+        values2 = np.fromiter((obs.value for obs in observables2), dtype=np.float64, count=len(observables2))
         covariance = np.cov(values1, values2)
         return covariance
     else:
         raise InvalidOperation("Covariance not computable")
 
 
+def _observables_to_arrays(observables) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Converts a list of observables into two numpy arrays (dates and values) sorted by date.
+    """
+    dates = np.array([obs.date for obs in observables], dtype="datetime64[D]")
+    values = np.fromiter((obs.value for obs in observables), dtype=np.float64, count=len(observables))
+    if len(dates) > 1 and np.any(dates[1:] < dates[:-1]):
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        values = values[order]
+    return dates, values
+
+
+def _get_observable_arrays(series_id: str, api_key: str, db_name="fred.db") -> (np.ndarray, np.ndarray):
+    """
+    Private function. Returns the observables of a series as two numpy arrays (dates and values) sorted by date.
+    Local data is read in columnar form; if the series has no local observables they are downloaded and stored as
+    :py:func:`get_observables` does.
+    """
+    client = _client(api_key, db_name)
+    cached = client._arrays_cache.get(series_id)
+    if cached is not None:
+        return cached
+    dates, values = client.database().get_observable_arrays(series_id)
+    if len(dates) == 0:
+        dates, values = _observables_to_arrays(get_observables(series_id, api_key, db_name))
+    # cached arrays are shared by all the callers
+    dates.flags.writeable = False
+    values.flags.writeable = False
+    client._arrays_cache.put(series_id, (dates, values))
+    return dates, values
+
+
+def _build_panel(columns) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Aligns a list of (dates, values) pairs on the union of their dates.
+    Returns the sorted dates and a matrix with one row per date and one column per series, NaN where a series has no
+    observable for that date.
+    """
+    if len(columns) == 0:
+        return np.empty(0, dtype="datetime64[D]"), np.empty((0, 0))
+    all_dates = np.unique(np.concatenate([dates for dates, _ in columns]))
+    panel = np.full((len(all_dates), len(columns)), np.nan)
+    for j, (dates, values) in enumerate(columns):
+        panel[np.searchsorted(all_dates, dates), j] = values
+    return all_dates, panel
+
+
+def _pairwise_moments(x_i, m_i, x_j, m_j) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Computes the pairwise-complete covariance and correlation between the columns of two blocks.
+    x_i and x_j are centered blocks with zeros in place of NaN, m_i and m_j are the corresponding presence masks.
+    """
+    n = m_i.T @ m_j
+    sum_i = x_i.T @ m_j
+    sum_j = m_i.T @ x_j
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (x_i.T @ x_j - sum_i * sum_j / n) / (n - 1)
+        var_i = ((x_i * x_i).T @ m_j - sum_i * sum_i / n) / (n - 1)
+        var_j = (m_i.T @ (x_j * x_j) - sum_j * sum_j / n) / (n - 1)
+        corr = np.clip(cov / np.sqrt(var_i * var_j), -1.0, 1.0)
+    cov[n < 2] = np.nan
+    corr[n < 2] = np.nan
+    return cov, corr
+
+
+def compute_covariance_matrix(series_list: List[Series], api_key, db_name="fred.db", pairwise=True,
+                              chunk_size=None) -> (np.ndarray, np.ndarray):
+    """
+    This function computes the covariance and the correlation matrices of a list of :class:`model.Series` in one pass.
+    Each series is loaded only once and all the series are aligned by date in a single panel, so it can be used on
+    all the series of a category (see :py:func:`get_series`).
+    The function uses local data if possible and saves all data downloaded via the internet to a database.
+
+    :param series_list: The series that you want to use for computation. Row and column i of the matrices refer to series_list[i]
+    :type series_list: List[Series]
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param pairwise: If true each pair of series uses all the dates on which both series have a value (pairwise-complete), otherwise only the dates on which every series has a value are used, defaults to True
+    :type pairwise: bool
+    :param chunk_size: The maximum number of series processed together when pairwise is true. Use it to bound memory usage on very wide panels, defaults to None (no chunking)
+    :type chunk_size: int
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :raises InvalidOperation: This exception is thrown if less than two series are given
+    :return: Two numpy ndarrays representing the variance covariance matrix and the correlation matrix. Pairs of series with less than two common dates are NaN
+    :rtype: (np.ndarray, np.ndarray)
+    """
+    if len(series_list) < 2:
+        raise InvalidOperation("Covariance matrix needs at least two series, got " + str(len(series_list)))
+    columns = [_get_observable_arrays(ser.series_id, api_key, db_name) for ser in series_list]
+    _, panel = _build_panel(columns)
+    if not pairwise:
+        panel = panel[~np.isnan(panel).any(axis=1)]
+        if len(panel) < 2:
+            raise InvalidOperation("Covariance not computable: the series have less than two dates in common")
+        return np.cov(panel, rowvar=False), np.corrcoef(panel, rowvar=False)
+
+    mask = ~np.isnan(panel)
+    # centering does not change the covariance but reduces the cancellation error of the sums below
+    with np.errstate(invalid="ignore"):
+        centered = np.where(mask, panel - np.nanmean(panel, axis=0), 0.0)
+    mask = mask.astype(np.float64)
+    size = len(series_list)
+    step = size if chunk_size is None else max(1, int(chunk_size))
+    covariance = np.empty((size, size))
+    correlation = np.empty((size, size))
+    for start_i in range(0, size, step):
+        block_i = slice(start_i, min(start_i + step, size))
+        for start_j in range(start_i, size, step):
+            block_j = slice(start_j, min(start_j + step, size))
+            cov, corr = _pairwise_moments(centered[:, block_i], mask[:, block_i], centered[:, block_j], mask[:, block_j])
+            covariance[block_i, block_j] = cov
+            correlation[block_i, block_j] = corr
+            covariance[block_j, block_i] = cov.T
+            correlation[block_j, block_i] = corr.T
+    return covariance, correlation
+
+
 def linear_regression(series: Series, api_key, db_name="fred.db") -> (float, float):
     """
     This function allows to calculate the coefficients of a regression line given an input :class:`model.Series`.
     The function uses local data if possible and saves all data downloaded via the internet to a database.
     The function returns two elements which are the coefficients b0 and b1 of the following expression for the regression line:
     **y = b0 + b1 * x**.
+    Results are cached in the database and, when the series is updated (see :py:func:`update_series`), only updated with the new observables.
 
     :param series: The series whose regression line you want to calculate
     :type series: Series
@@ -363,15 +1141,657 @@ def linear_regression(series: Series, api_key, db_name="fred.db") -> (float, flo
     :return: Two values b0 and b1 of the following expression for the regression line: y = b0 + b1*x
     :rtype: (float,float)
     """
-    observables = get_observables(series.series_id, api_key, db_name)
-    values_x = []
-    values_y = []
-    for obs in observables:
-        days = (dt.strptime(obs.date, "%Y-%m-%d") - dt(1970, 1, 1)).days
-        values_x.append(days)
-        values_y.append(obs.value)
-    cov = np.cov(np.array(values_x), np.array(values_y))[0][1]
-    var = np.var(np.array(values_x))
-    b1 = cov / var
-    b0 = np.mean(np.array(values_y)) - (b1 * np.mean(np.array(values_x)))
-    return b0, b1
+    _, coefficients = _derived_arrays(series, "linear_regression", (), api_key, db_name)
+    return float(coefficients[0]), float(coefficients[1])
+
+
+class RegressionResult:
+    """
+    This class represents the result of a least squares regression computed by :py:func:`multiple_regression` or :py:func:`batch_linear_regression`.
+    Do not build this class directly.
+
+    The coefficients refer to the expression **y = b0 + b1 * x1 + ... + bk * xk**, where b0 is the intercept.
+    When time is used as a regressor, it is expressed as an epochday (number of days since 1970-01-01).
+    """
+
+    def __init__(self, coefficients, residuals, r_squared, dates):
+        """
+
+        :param coefficients: The coefficients b0, b1, ..., bk of the regression
+        :type coefficients: np.ndarray
+        :param residuals: The residuals of the regression, one for each date used
+        :type residuals: np.ndarray
+        :param r_squared: The coefficient of determination of the regression
+        :type r_squared: float
+        :param dates: The dates of the observables used by the regression
+        :type dates: np.ndarray
+        """
+        self.coefficients = coefficients
+        self.residuals = residuals
+        self.r_squared = r_squared
+        self.dates = dates
+
+    def __str__(self):
+        return "Coefficients: " + str(self.coefficients) + " R squared: " + str(self.r_squared) + " Observables: " + str(
+            len(self.dates))
+
+
+def _design_matrix(regressors) -> np.ndarray:
+    """
+    Private function. Builds a design matrix with a leading intercept column from a list of regressor arrays.
+    """
+    design = np.empty((len(regressors[0]), len(regressors) + 1))
+    design[:, 0] = 1.0
+    for j, regressor in enumerate(regressors):
+        design[:, j + 1] = regressor
+    return design
+
+
+def _least_squares(design: np.ndarray, y: np.ndarray) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Private function. Solves the least squares problem for one (1-d y) or many (2-d y, one column per series) responses
+    sharing the same design matrix. Returns coefficients, residuals and R squared.
+    """
+    if design.shape[0] < design.shape[1]:
+        raise InvalidOperation("Regression needs at least " + str(design.shape[1]) + " observables, got " + str(
+            design.shape[0]))
+    coefficients = np.linalg.lstsq(design, y, rcond=None)[0]
+    residuals = y - design @ coefficients
+    total = np.sum((y - y.mean(axis=0)) ** 2, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = 1.0 - np.sum(residuals ** 2, axis=0) / total
+    return coefficients, residuals, r_squared
+
+
+def multiple_regression(series: Series, regressors: List[Series], api_key, db_name="fred.db",
+                        time_trend=False) -> RegressionResult:
+    """
+    This function regresses a :class:`model.Series` on several other series and, optionally, on time.
+    Only the dates on which all the series have an observable are used.
+    The function uses local data if possible and saves all data downloaded via the internet to a database.
+
+    :param series: The series that you want to explain (the response y)
+    :type series: Series
+    :param regressors: The series used as explanatory variables x1, ..., xk, in this order. It can be empty if time_trend is true
+    :type regressors: List[Series]
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param time_trend: If true, time (as epochday) is added as the last regressor, defaults to False
+    :type time_trend: bool
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :raises InvalidOperation: This exception is thrown if there are no regressors or if the series have too few dates in common
+    :return: The result of the regression
+    :rtype: RegressionResult
+    """
+    if len(regressors) == 0 and not time_trend:
+        raise InvalidOperation("Regression needs at least one regressor")
+    columns = [_get_observable_arrays(ser.series_id, api_key, db_name) for ser in [series] + list(regressors)]
+    dates, panel = _build_panel(columns)
+    complete = ~np.isnan(panel).any(axis=1)
+    dates = dates[complete]
+    panel = panel[complete]
+    explanatory = [panel[:, j] for j in range(1, panel.shape[1])]
+    if time_trend:
+        explanatory.append(dates.astype(np.int64))
+    coefficients, residuals, r_squared = _least_squares(_design_matrix(explanatory), panel[:, 0])
+    return RegressionResult(coefficients, residuals, float(r_squared), dates)
+
+
+def batch_linear_regression(series_list: List[Series], api_key, db_name="fred.db") -> Dict[str, RegressionResult]:
+    """
+    This function computes the regression line of many :class:`model.Series` at once, as :py:func:`linear_regression` does for one series.
+    Series observed on the same dates are fitted together with a single least squares solve.
+    The function uses local data if possible and saves all data downloaded via the internet to a database.
+
+    :param series_list: The series whose regression line you want to calculate
+    :type series_list: List[Series]
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :raises InvalidOperation: This exception is thrown if a series has less than three observables
+    :return: A dictionary mapping each series id to the result of its regression, whose coefficients are b0 and b1 of y = b0 + b1*x
+    :rtype: Dict[str, RegressionResult]
+    """
+    columns = [_get_observable_arrays(ser.series_id, api_key, db_name) for ser in series_list]
+    dates, panel = _build_panel(columns)
+    mask = ~np.isnan(panel)
+    days = dates.astype(np.int64)
+    results = {}
+    # series with the same dates share the design matrix and are solved together
+    patterns, groups = np.unique(mask.T, axis=0, return_inverse=True)
+    for g, pattern in enumerate(patterns):
+        members = np.flatnonzero(groups.ravel() == g)
+        design = _design_matrix([days[pattern]])
+        coefficients, residuals, r_squared = _least_squares(design, panel[pattern][:, members])
+        for k, j in enumerate(members):
+            results[series_list[j].series_id] = RegressionResult(coefficients[:, k], residuals[:, k],
+                                                                 float(r_squared[k]), dates[pattern])
+    return {ser.series_id: results[ser.series_id] for ser in series_list}
+
+
+_downsampling_methods = ("mean", "sum", "first", "last", "max", "min")
+_upsampling_methods = ("ffill", "interpolate")
+
+
+def _period_codes(dates: np.ndarray, frequency: Frequency) -> np.ndarray:
+    """
+    Private function. Maps each date to an integer identifying the calendar period of the given frequency it belongs to.
+    Weeks start on Monday, quarters, semesters and years start on January.
+    """
+    if frequency in (Frequency.Daily, Frequency.Weekly, Frequency.Biweekly):
+        days = dates.astype("datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday: shifting by 3 days makes the periods start on Monday
+        return {Frequency.Daily: days, Frequency.Weekly: (days + 3) // 7,
+                Frequency.Biweekly: (days + 3) // 14}[frequency]
+    months = dates.astype("datetime64[M]").astype(np.int64)
+    return months // {Frequency.Monthly: 1, Frequency.Quarterly: 3, Frequency.Semiannual: 6,
+                      Frequency.Annual: 12}[frequency]
+
+
+def _period_starts(codes: np.ndarray, frequency: Frequency) -> np.ndarray:
+    """
+    Private function. Inverse of :py:func:`_period_codes`: returns the first day of each period as datetime64[D].
+    """
+    if frequency is Frequency.Daily:
+        return codes.astype("datetime64[D]")
+    if frequency is Frequency.Weekly:
+        return (codes * 7 - 3).astype("datetime64[D]")
+    if frequency is Frequency.Biweekly:
+        return (codes * 14 - 3).astype("datetime64[D]")
+    months = codes * {Frequency.Monthly: 1, Frequency.Quarterly: 3, Frequency.Semiannual: 6,
+                      Frequency.Annual: 12}[frequency]
+    return months.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def _resample(dates: np.ndarray, values: np.ndarray, frequency: Frequency, how: str) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Resamples date-sorted arrays to the given frequency, see :py:func:`resample_series`.
+    Returns the period start dates and the resampled values.
+    """
+    if len(dates) == 0:
+        return dates.astype("datetime64[D]"), values
+    codes = _period_codes(dates, frequency)
+    if how in _downsampling_methods:
+        starts = np.flatnonzero(np.concatenate(([True], codes[1:] != codes[:-1])))
+        ends = np.append(starts[1:], len(values))
+        if how == "mean":
+            result = np.add.reduceat(values, starts) / (ends - starts)
+        elif how == "sum":
+            result = np.add.reduceat(values, starts)
+        elif how == "max":
+            result = np.maximum.reduceat(values, starts)
+        elif how == "min":
+            result = np.minimum.reduceat(values, starts)
+        elif how == "first":
+            result = values[starts]
+        else:
+            result = values[ends - 1]
+        return _period_starts(codes[starts], frequency), result
+    if how in _upsampling_methods:
+        source_days = dates.astype("datetime64[D]").astype(np.int64)
+        target = _period_starts(np.arange(codes[0], codes[-1] + 1), frequency)
+        target = target[target >= dates[0]]
+        target_days = target.astype(np.int64)
+        if how == "ffill":
+            result = values[np.searchsorted(source_days, target_days, side="right") - 1]
+        else:
+            result = np.interp(target_days, source_days, values)
+        return target, result
+    raise InvalidOperation("Unknown resampling method: " + str(how))
+
+
+def resample_series(series: Series, frequency: Frequency, api_key, db_name="fred.db", how="mean") -> List[Observable]:
+    """
+    This function converts a :class:`model.Series` to another sampling :class:`model.Frequency`, for example a daily series to a monthly one or a quarterly series to a monthly one.
+    Observables are grouped by calendar period (weeks start on Monday, quarters, semesters and years on January) and each resulting observable is dated with the first day of its period, as FRED does.
+    The function uses local data if possible and saves all data downloaded via the internet to a database.
+
+    Downsampling methods are mean, sum, first, last, max and min; upsampling methods are ffill (each period takes the last known value) and interpolate (linear interpolation between observables).
+
+    :param series: The series that you want to resample
+    :type series: Series
+    :param frequency: The target frequency
+    :type frequency: Frequency
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param how: The aggregation (downsampling) or filling (upsampling) method, defaults to mean
+    :type how: str
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication
+    :raises InvalidOperation: This exception is thrown if the method is unknown, or if a downsampling method is used with a finer target frequency (resp. an upsampling method with a coarser one)
+    :return: A list of observables sampled with the target frequency
+    :rtype: List[Observable]
+    """
+    source_days = series.frequency_short.to_number_of_days()
+    target_days = frequency.to_number_of_days()
+    if how in _downsampling_methods and target_days < source_days:
+        raise InvalidOperation("Cannot downsample a series of frequency " + str(series.frequency_short) + " to "
+                               + str(frequency) + ", use an upsampling method")
+    if how in _upsampling_methods and target_days > source_days:
+        raise InvalidOperation("Cannot upsample a series of frequency " + str(series.frequency_short) + " to "
+                               + str(frequency) + ", use a downsampling method")
+    dates, values = _get_observable_arrays(series.series_id, api_key, db_name)
+    dates, values = _resample(dates, values, frequency, how)
+    return _arrays_to_observables(dates, values, series.series_id)
+
+
+class BatchResult:
+    """
+    This class represents the outcome of an analytic run on a single series by :py:func:`run_batch_analytics`.
+    Exactly one of result and error is not None.
+    """
+
+    def __init__(self, series_id, result=None, error=None):
+        """
+
+        :param series_id: The id of the series the analytic was run on
+        :type series_id: str
+        :param result: The value returned by the analytic, None if it failed
+        :type result: Any
+        :param error: The exception raised by the analytic, None if it succeeded
+        :type error: Exception
+        """
+        self.series_id = series_id
+        self.result = result
+        self.error = error
+
+    def __str__(self):
+        if self.error is not None:
+            return "ID-> " + str(self.series_id) + " Error-> " + str(self.error)
+        return "ID-> " + str(self.series_id) + " Result-> " + str(self.result)
+
+
+def _resolve_series(series_id: str, api_key: str, db_name: str) -> Series:
+    """
+    Private function. Returns a series given its id, from the database if possible, from FRED otherwise.
+    """
+    try:
+        return _client(api_key, db_name).database()._get_single_series(series_id)
+    except SeriesNotFound:
+        return _client(api_key, db_name).fred.get_single_series(series_id)
+
+
+def _run_analytic(series_id: str, analytic, args, api_key: str, db_name: str) -> BatchResult:
+    """
+    Private function. Runs in a worker process of :py:func:`run_batch_analytics`: applies the analytic to the series,
+    reporting any error in the result.
+    """
+    try:
+        series = _resolve_series(series_id, api_key, db_name)
+        return BatchResult(series_id, result=analytic(series, *args, api_key, db_name))
+    except Exception as e:
+        return BatchResult(series_id, error=e)
+
+
+def run_batch_analytics(series, analytic, api_key: str, db_name="fred.db", args=(), processes=None) -> Iterator[BatchResult]:
+    """
+    This function runs the same analytic on many :class:`model.Series` using a pool of processes.
+    The analytic can be any function of this module taking a series as first argument and api_key and db_name as last arguments, for example:
+    run_batch_analytics(category_id, moving_average, api_key, args=(12,)).
+    Each worker process opens its own connection to the database.
+    Results are yielded as soon as they are available, so their order is not the order of the series. An error on a series does not stop the others: it is reported in the corresponding :class:`BatchResult`.
+
+    :param series: A category id, to use all the series of the category (see :py:func:`get_series`), or a list of series ids
+    :type series: int or List[str]
+    :param analytic: The function to run on each series. It must be defined at module level, so that it can be sent to the worker processes
+    :type analytic: Callable
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param args: The arguments of the analytic placed between the series and the api key, for example the period of the moving average, defaults to ()
+    :type args: tuple
+    :param processes: The number of worker processes, defaults to None (the number of processors of the machine)
+    :type processes: int
+    :raises BadRequestException: This exception is thrown when an error occurs during http communication while retrieving the series of a category
+    :return: An iterator over the results, one for each series
+    :rtype: Iterator[BatchResult]
+    """
+    if isinstance(series, int):
+        series_ids = [ser.series_id for ser in get_series(series, api_key, db_name)]
+    else:
+        series_ids = list(series)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {executor.submit(_run_analytic, series_id, analytic, tuple(args), api_key, db_name): series_id
+                   for series_id in series_ids}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                yield BatchResult(futures[future], error=e)
+
+
+class _LRUCache:
+    """
+    Private class. A thread safe dictionary keeping at most size entries, the least recently used are evicted first.
+    A size of 0 disables the cache.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_current = threading.local()
+_shared_clients = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _client(api_key: str, db_name=None):
+    """
+    Private function. Returns the client the functions of this module must use: the client whose method is running in
+    the calling thread if it uses the same api key and database, otherwise a client shared by all the calls made with
+    this api key and database in this process. Shared clients have no in-memory caches.
+    """
+    current = getattr(_current, "client", None)
+    if current is not None and current.api_key == api_key and (db_name is None or current.db_name == db_name):
+        return current
+    key = (os.getpid(), api_key, "fred.db" if db_name is None else db_name)
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = FredClient(api_key, key[2], cache_size=0)
+            _shared_clients[key] = client
+    return client
+
+
+class FredClient:
+    """
+    This class keeps the resources used to interact with FRED and with a database alive across calls: an HTTP session,
+    a rate limiter shared by all its requests, a pool of database connections (one for each thread) and in-memory
+    caches of the series of each category and of the observables of each series.
+    Use a single FredClient in long-running programs, for example:
+    client = FredClient(api_key); client.moving_average(series, 12).
+
+    All the functions of this module are available as methods, without the api_key and db_name parameters.
+    The functions themselves use a client shared by all the calls made with the same api key and database, which has no in-memory caches.
+    The in-memory caches assume that the database is only modified through this client: use clear_cache otherwise.
+    """
+
+    def __init__(self, api_key: str, db_name="fred.db", requests_per_minute=120, cache_size=256):
+        """
+        Builder of the class.
+
+        :param api_key: A valid Fred API Key
+        :type api_key: str
+        :param db_name: The name of the database you want to use, defaults to fred.db
+        :type db_name: str
+        :param requests_per_minute: The maximum number of requests per minute made to FRED, defaults to 120 (the limit of FRED's API)
+        :type requests_per_minute: int
+        :param cache_size: The maximum number of categories and of series kept in the in-memory caches, 0 disables them, defaults to 256
+        :type cache_size: int
+        """
+        self.api_key = api_key
+        self.db_name = db_name
+        # the HTTP session (and the requests package) are only loaded when FRED is first used
+        self._session = None
+        self._fred = None
+        self._lock = threading.Lock()
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self._pool = DatabasePool(db_name)
+        self._series_cache = _LRUCache(cache_size)
+        self._arrays_cache = _LRUCache(cache_size)
+
+    @property
+    def fred(self) -> Fred:
+        """
+        The :class:`Fred` object used for all the requests of this client, sharing its session and rate limiter.
+        It is created on first use, together with the HTTP session.
+        """
+        if self._fred is None:
+            with self._lock:
+                if self._fred is None:
+                    import requests
+                    self._session = requests.Session()
+                    self._fred = Fred(self.api_key, self.rate_limiter, self._session)
+        return self._fred
+
+    @property
+    def session(self):
+        """
+        The HTTP session used for all the requests to FRED.
+        """
+        return self.fred.session
+
+    def database(self) -> Database:
+        """
+        This method returns the connection to the database of the calling thread.
+
+        :return: An open connection to the database
+        :rtype: Database
+        """
+        return self._pool.get()
+
+    def _fred_with_limit(self, requests_per_minute):
+        if requests_per_minute is None:
+            return self.fred
+        return Fred(self.api_key, RateLimiter(requests_per_minute), self.session)
+
+    def _forget_series(self, series_id):
+        self._arrays_cache.pop(series_id)
+        self._series_cache.clear()
+
+    def clear_cache(self):
+        """
+        This method empties the in-memory caches. Use it when the database has been modified by other programs.
+        """
+        self._series_cache.clear()
+        self._arrays_cache.clear()
+
+    def close(self):
+        """
+        This method closes the HTTP session and the connections to the database.
+        """
+        self._pool.close()
+        if self._session is not None:
+            self._session.close()
+
+    @contextmanager
+    def _active(self):
+        previous = getattr(_current, "client", None)
+        _current.client = self
+        try:
+            yield self
+        finally:
+            _current.client = previous
+
+    def get_children_categories_recursive(self, parent_category: int, max_workers=8,
+                                          requests_per_minute=None) -> List[Category]:
+        """
+        See :py:func:`get_children_categories_recursive`.
+        """
+        with self._active():
+            return get_children_categories_recursive(parent_category, self.api_key, max_workers, requests_per_minute)
+
+    def get_children_categories_iterative(self, parent_category_id: int, max_workers=8,
+                                          requests_per_minute=None) -> List[Category]:
+        """
+        See :py:func:`get_children_categories_iterative`.
+        """
+        with self._active():
+            return get_children_categories_iterative(parent_category_id, self.api_key, self.db_name, max_workers,
+                                                     requests_per_minute)
+
+    def sync_category_tree(self, parent_category_id: int, trees=(), max_age=None, max_checks=None, max_workers=8,
+                           requests_per_minute=None) -> CategoryChangeSet:
+        """
+        See :py:func:`sync_category_tree`.
+        """
+        with self._active():
+            return sync_category_tree(parent_category_id, self.api_key, self.db_name, trees, max_age, max_checks,
+                                      max_workers, requests_per_minute)
+
+    def get_category_tree(self, parent_category_id: int, snapshot_file=None) -> CategoryTree:
+        """
+        See :py:func:`get_category_tree`.
+        """
+        with self._active():
+            return get_category_tree(parent_category_id, self.api_key, self.db_name, snapshot_file)
+
+    def get_lazy_category_tree(self, parent_category_id: int, prefetch=0, max_workers=8) -> LazyCategoryTree:
+        """
+        See :py:func:`get_lazy_category_tree`. The children are loaded with this client even after the call returns.
+        """
+        with self._active():
+            return get_lazy_category_tree(parent_category_id, self.api_key, self.db_name, prefetch, max_workers)
+
+    def search_categories(self, text: str, limit=20, prefix=True) -> List[Category]:
+        """
+        See :py:func:`search_categories`.
+        """
+        with self._active():
+            return search_categories(text, self.api_key, self.db_name, limit, prefix)
+
+    def search_series(self, text: str, limit=20, prefix=True) -> List[Series]:
+        """
+        See :py:func:`search_series`.
+        """
+        with self._active():
+            return search_series(text, self.api_key, self.db_name, limit, prefix)
+
+    def get_series(self, category_id: int) -> List[Series]:
+        """
+        See :py:func:`get_series`.
+        """
+        with self._active():
+            return get_series(category_id, self.api_key, self.db_name)
+
+    def update_series(self, series_id: str, force=False) -> bool:
+        """
+        See :py:func:`update_series`.
+        """
+        with self._active():
+            return update_series(series_id, self.api_key, self.db_name, force)
+
+    def get_observables(self, series_id: str) -> List[Observable]:
+        """
+        See :py:func:`get_observables`.
+        """
+        with self._active():
+            return get_observables(series_id, self.api_key, self.db_name)
+
+    def get_observables_many(self, series_ids: List[str], max_workers=8, requests_per_minute=None,
+                             batch_size=50) -> Dict[str, List[Observable]]:
+        """
+        See :py:func:`get_observables_many`.
+        """
+        with self._active():
+            return get_observables_many(series_ids, self.api_key, self.db_name, max_workers, requests_per_minute,
+                                        batch_size)
+
+    def update_category(self, category_id: int, force=False) -> bool:
+        """
+        See :py:func:`update_category`.
+        """
+        with self._active():
+            return update_category(category_id, self.api_key, self.db_name, force)
+
+    def refresh_category(self, category_id: int, force=False, max_workers=8,
+                         requests_per_minute=None) -> CategoryUpdateReport:
+        """
+        See :py:func:`refresh_category`.
+        """
+        with self._active():
+            return refresh_category(category_id, self.api_key, self.db_name, force, max_workers, requests_per_minute)
+
+    def moving_average(self, series: Series, n: int) -> List[Observable]:
+        """
+        See :py:func:`moving_average`.
+        """
+        with self._active():
+            return moving_average(series, n, self.api_key, self.db_name)
+
+    def prime_differences(self, series: Series) -> List[Observable]:
+        """
+        See :py:func:`prime_differences`.
+        """
+        with self._active():
+            return prime_differences(series, self.api_key, self.db_name)
+
+    def prime_differences_percent(self, series: Series) -> List[Observable]:
+        """
+        See :py:func:`prime_differences_percent`.
+        """
+        with self._active():
+            return prime_differences_percent(series, self.api_key, self.db_name)
+
+    def compute_covariance(self, series1: Series, series2: Series) -> np.ndarray:
+        """
+        See :py:func:`compute_covariance`.
+        """
+        with self._active():
+            return compute_covariance(series1, series2, self.api_key, self.db_name)
+
+    def compute_covariance_matrix(self, series_list: List[Series], pairwise=True,
+                                  chunk_size=None) -> (np.ndarray, np.ndarray):
+        """
+        See :py:func:`compute_covariance_matrix`.
+        """
+        with self._active():
+            return compute_covariance_matrix(series_list, self.api_key, self.db_name, pairwise, chunk_size)
+
+    def linear_regression(self, series: Series) -> (float, float):
+        """
+        See :py:func:`linear_regression`.
+        """
+        with self._active():
+            return linear_regression(series, self.api_key, self.db_name)
+
+    def multiple_regression(self, series: Series, regressors: List[Series], time_trend=False) -> RegressionResult:
+        """
+        See :py:func:`multiple_regression`.
+        """
+        with self._active():
+            return multiple_regression(series, regressors, self.api_key, self.db_name, time_trend)
+
+    def batch_linear_regression(self, series_list: List[Series]) -> Dict[str, RegressionResult]:
+        """
+        See :py:func:`batch_linear_regression`.
+        """
+        with self._active():
+            return batch_linear_regression(series_list, self.api_key, self.db_name)
+
+    def resample_series(self, series: Series, frequency: Frequency, how="mean") -> List[Observable]:
+        """
+        See :py:func:`resample_series`.
+        """
+        with self._active():
+            return resample_series(series, frequency, self.api_key, self.db_name, how)
+
+    def run_batch_analytics(self, series, analytic, args=(), processes=None) -> Iterator[BatchResult]:
+        """
+        See :py:func:`run_batch_analytics`. The worker processes do not share the resources of the client.
+        """
+        if isinstance(series, int):
+            series = [ser.series_id for ser in self.get_series(series)]
+        return run_batch_analytics(series, analytic, self.api_key, self.db_name, args, processes)
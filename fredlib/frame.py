@@ -0,0 +1,138 @@
+"""
+This module contains the SeriesFrame class which can be used to chain transformations on a series without loading
+the series and materializing its observables at each step.
+"""
+
+from api import *
+from api import _get_observable_arrays, _resample, _diff_inplace, _pct_inplace, _rolling_mean_inplace, \
+    _arrays_to_observables
+import numpy as np
+
+
+class SeriesFrame:
+    """
+    This class represents a lazy sequence of transformations applied to a :class:`model.Series`.
+    Transformations are only recorded when invoked, for example:
+    frame = SeriesFrame("GDP", api_key).diff().pct().rolling_mean(12).
+    The series is loaded once, when one of compute or to_observables is invoked, and all the transformations are run
+    on a single numpy buffer; consecutive differences are fused into a single n-th order difference.
+
+    Each transformation dates its results as the corresponding functions in the api module do: the prime difference
+    between two observables is dated with the first one and the mean of a window with the first date of the window.
+    """
+
+    def __init__(self, series_id: str, api_key: str, db_name="fred.db", _operations=()):
+        """
+        Builder of the class.
+
+        :param series_id: The id of the series to transform
+        :type series_id: str
+        :param api_key: A valid Fred API Key
+        :type api_key: str
+        :param db_name: The name of the database you want to use, defaults to fred.db
+        :type db_name: str
+        """
+        self.series_id = series_id
+        self.api_key = api_key
+        self.db_name = db_name
+        self._operations = tuple(_operations)
+
+    def _then(self, operation):
+        return SeriesFrame(self.series_id, self.api_key, self.db_name, self._operations + (operation,))
+
+    def diff(self):
+        """
+        Records the prime differences of the series, see :py:func:`prime_differences`.
+
+        :return: A new SeriesFrame with the operation appended
+        :rtype: SeriesFrame
+        """
+        return self._then(("diff", 1))
+
+    def pct(self):
+        """
+        Records the prime percentage differences of the series, see :py:func:`prime_differences_percent`.
+
+        :return: A new SeriesFrame with the operation appended
+        :rtype: SeriesFrame
+        """
+        return self._then(("pct",))
+
+    def rolling_mean(self, n: int):
+        """
+        Records the moving average of the series on a period of n observables, see :py:func:`moving_average`.
+
+        :param n: An integer representing the period of the moving average
+        :type n: int
+        :return: A new SeriesFrame with the operation appended
+        :rtype: SeriesFrame
+        """
+        return self._then(("rolling_mean", int(n)))
+
+    def resample(self, frequency: Frequency, how="mean"):
+        """
+        Records the conversion of the series to another frequency, see :py:func:`resample_series`.
+
+        :param frequency: The target frequency
+        :type frequency: Frequency
+        :param how: The aggregation (downsampling) or filling (upsampling) method, defaults to mean
+        :type how: str
+        :return: A new SeriesFrame with the operation appended
+        :rtype: SeriesFrame
+        """
+        return self._then(("resample", frequency, how))
+
+    def _plan(self):
+        """
+        Private method. Returns the recorded operations with consecutive differences fused.
+        """
+        plan = []
+        for operation in self._operations:
+            if operation[0] == "diff" and len(plan) > 0 and plan[-1][0] == "diff":
+                plan[-1] = ("diff", plan[-1][1] + operation[1])
+            else:
+                plan.append(operation)
+        return plan
+
+    def compute(self) -> (np.ndarray, np.ndarray):
+        """
+        Loads the series and runs all the recorded operations.
+        The function uses local data if possible and saves all data downloaded via the internet to a database.
+
+        :raises BadRequestException: This exception is thrown when an error occurs during http communication
+        :raises InvalidOperation: This exception is thrown if a moving average period is greater than the number of values left
+        :return: Two numpy arrays: the dates (datetime64[D]) and the values of the transformed series
+        :rtype: (np.ndarray, np.ndarray)
+        """
+        dates, values = _get_observable_arrays(self.series_id, self.api_key, self.db_name)
+        buffer = np.array(values, dtype=np.float64)
+        size = len(buffer)
+        for operation in self._plan():
+            name = operation[0]
+            if name == "diff":
+                size = _diff_inplace(buffer, size, operation[1])
+            elif name == "pct":
+                size = _pct_inplace(buffer, size)
+            elif name == "rolling_mean":
+                size = _rolling_mean_inplace(buffer, size, operation[1])
+            elif name == "resample":
+                dates, resampled = _resample(dates[:size], buffer[:size], operation[1], operation[2])
+                buffer = np.array(resampled, dtype=np.float64)
+                size = len(buffer)
+        return dates[:size], buffer[:size]
+
+    def to_observables(self) -> List[Observable]:
+        """
+        Loads the series, runs all the recorded operations and returns the result as a list of :class:`model.Observable`.
+
+        :raises BadRequestException: This exception is thrown when an error occurs during http communication
+        :raises InvalidOperation: This exception is thrown if a moving average period is greater than the number of values left
+        :return: The list of the transformed observables
+        :rtype: List[Observable]
+        """
+        dates, values = self.compute()
+        return _arrays_to_observables(dates, values, self.series_id)
+
+    def __str__(self):
+        return "SeriesFrame(" + str(self.series_id) + ")" + "".join(
+            "." + operation[0] + "(" + ", ".join(str(arg) for arg in operation[1:]) + ")" for operation in self._operations)
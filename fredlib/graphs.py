@@ -2,16 +2,17 @@
 This module contains classes and functions for the graphic representation of one or more series and its data.
 """
 
-from typing import List
-from matplotlib import pyplot as plt
 from model import *
-from datetime import datetime as dt, datetime, timedelta
 from api import *
+from api import _get_observable_arrays, _observables_to_arrays, _resolve_series
+from _core import _PackageError
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import numpy as np
 import math
+import time
 
 
-class NotPlottableSeries(Exception):
+class NotPlottableSeries(_PackageError):
     """
     ..autoexception::NotPlottableSeries
 
@@ -37,30 +38,35 @@ class SeriesGraph:
 
         :param series: The series that you want to plot.
         :type series: Series
-        :param date_list: A list of datetime objects you want to tick on the x-axis
-        :type date_list: List[datetime]
+        :param date_list: The dates you want to tick on the x-axis, stored as a numpy datetime64[D] array
+        :type date_list: np.ndarray or List[datetime]
         :param min_y_value: The smallest value among the observables in the series
         :type min_y_value: float
         :param max_y_value: The biggest value among the observables in the series
         :type max_y_value: float
-        :param axis_x_values: A list of the x-axis values. Each item on the list must be an epochday list
-        :type axis_x_values: List[int]
-        :param axis_y_values: A list of the y-axis values. Each item on the list must be a float list
-        :type axis_y_values: List[float]
+        :param axis_x_values: The x-axis values as epoch days, stored as a numpy int64 array
+        :type axis_x_values: np.ndarray or List[int]
+        :param axis_y_values: The y-axis values, stored as a numpy float64 array
+        :type axis_y_values: np.ndarray or List[float]
         """
-        self.date_list = date_list
+        self.date_list = np.asarray(date_list, dtype="datetime64[D]")
         self.min_y_value = min_y_value
         self.max_y_value = max_y_value
         self.series = [series]
-        self.axis_x_values = [axis_x_values]
-        self.axis_y_values = [axis_y_values]
+        self.axis_x_values = [np.asarray(axis_x_values, dtype=np.int64)]
+        self.axis_y_values = [np.asarray(axis_y_values, dtype=np.float64)]
         self.linear_regression = None
 
-    def plot(self, fig_size=(14, 8), dpi=150, xlabel="Dates", ylabel="Values", title=""):
+    def plot(self, fig_size=(14, 8), dpi=150, xlabel="Dates", ylabel="Values", title="", downsample=True,
+             downsample_threshold=5000):
         """
         This method allows the trend of the series to be represented on a graph.
         Note that the method does not make a call to pyplot.show, so you will need to do it when you want to see the graph.
 
+        Series longer than downsample_threshold points are downsampled before being drawn: for each pixel column of the
+        figure only the first, last, smallest and biggest values are kept, so the drawn lines look the same while
+        rendering is faster and vector outputs are smaller.
+
         :param fig_size: The size of the matplotlib figure, defaults to (14,8)
         :type fig_size: (int,int)
         :param dpi: The dpi of the graph, defaults to 150
@@ -71,33 +77,80 @@ class SeriesGraph:
         :type ylabel: str
         :param title: The title of the graph. If you use the default value, the title will be the concatenation of series titles, defaults to ""
         :type title: str
+        :param downsample: Set this flag to false to draw every point of the series, defaults to True
+        :type downsample: bool
+        :param downsample_threshold: The number of points above which a series is downsampled, defaults to 5000
+        :type downsample_threshold: int
         """
-        colors = ["blue", "orange", "red", "green", "pink", "grey", "brown", "yellow"]
+        from matplotlib import pyplot as plt
         plt.figure(figsize=fig_size, dpi=dpi)
+        self._draw(plt.gca(), fig_size, dpi, xlabel, ylabel, title, downsample, downsample_threshold)
+
+    def save(self, file_name, fig_size=(14, 8), dpi=150, xlabel="Dates", ylabel="Values", title="", downsample=True,
+             downsample_threshold=5000):
+        """
+        This method draws the graph into a file, without using pyplot: the figure is rendered by the non-interactive Agg
+        backend and released as soon as the file is written, so it can be used in loops, threads and worker processes.
+        The format is chosen from the extension of the file name, for example png or svg.
+        The parameters are the same of the plot method.
+
+        :param file_name: The name of the file to write
+        :type file_name: str
+        :param fig_size: The size of the matplotlib figure, defaults to (14,8)
+        :type fig_size: (int,int)
+        :param dpi: The dpi of the graph, defaults to 150
+        :type dpi: int
+        :param xlabel: The label that you want to put on the x-axis, defaults to Dates
+        :type xlabel: str
+        :param ylabel: The label that you want to put on the y-axis, defaults to Values
+        :type ylabel: str
+        :param title: The title of the graph. If you use the default value, the title will be the concatenation of series titles, defaults to ""
+        :type title: str
+        :param downsample: Set this flag to false to draw every point of the series, defaults to True
+        :type downsample: bool
+        :param downsample_threshold: The number of points above which a series is downsampled, defaults to 5000
+        :type downsample_threshold: int
+        """
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        figure = Figure(figsize=fig_size, dpi=dpi)
+        FigureCanvasAgg(figure)
+        try:
+            self._draw(figure.add_subplot(), fig_size, dpi, xlabel, ylabel, title, downsample, downsample_threshold)
+            figure.savefig(file_name)
+        finally:
+            figure.clear()
+
+    def _draw(self, axes, fig_size, dpi, xlabel, ylabel, title, downsample, downsample_threshold):
+        """
+        Private method. Draws the graph on the given matplotlib Axes.
+        """
+        colors = ["blue", "orange", "red", "green", "pink", "grey", "brown", "yellow"]
         if title == "":
             for ser in self.series:
                 title += ser.title + " from " + ser.observation_start + " to " + ser.observation_end + "\n"
-        plt.title(title)
+        axes.set_title(title)
 
-        plt.xlabel(xlabel, color='blue', size="large")
-        plt.ylabel(ylabel, color='blue', size="large")
-        plt.yticks(np.arange(self.min_y_value, self.max_y_value, (self.max_y_value - self.min_y_value) / 10))
+        axes.set_xlabel(xlabel, color='blue', size="large")
+        axes.set_ylabel(ylabel, color='blue', size="large")
+        axes.set_yticks(np.arange(self.min_y_value, self.max_y_value, (self.max_y_value - self.min_y_value) / 10))
 
-        ticks_x = []
-        for date in self.date_list:
-            ticks_x.append(str(date).split(" ")[0])
-        list_of_epochday = []
-        for date in self.date_list:
-            list_of_epochday.append((date - dt(1970, 1, 1)).days)
-        plt.xticks(list_of_epochday, ticks_x, rotation=45, size="small")
+        list_of_epochday = self.date_list.astype(np.int64)
+        axes.set_xticks(list_of_epochday)
+        axes.set_xticklabels(np.datetime_as_string(self.date_list, unit="D"), rotation=45, size="small")
 
+        pixels = int(fig_size[0] * dpi)
         for i in range(len(self.axis_x_values)):
-            plt.plot(self.axis_x_values[i], self.axis_y_values[i], color=colors[i], label=self.series[i].title)
+            x, y = self.axis_x_values[i], self.axis_y_values[i]
+            if downsample and len(x) > downsample_threshold:
+                x, y = _downsample(x, y, pixels)
+            axes.plot(x, y, color=colors[i], label=self.series[i].title)
         if self.linear_regression is not None:
-            x = np.arange(list_of_epochday[0], list_of_epochday[len(list_of_epochday) - 1])
+            # a straight line only needs its ends
+            x = np.array([list_of_epochday[0], list_of_epochday[len(list_of_epochday) - 1]])
             y = self.linear_regression[1] * x + self.linear_regression[0]
-            plt.plot(x, y, label="Linear regression", color="black")
-        plt.legend(loc="best")
+            axes.plot(x, y, label="Linear regression", color="black")
+        axes.legend(loc="best")
 
     def merge(self, other_graph):
         """
@@ -148,19 +201,40 @@ class SeriesGraph:
         self.linear_regression = (b0, b1)
 
 
-def _sort_observables(observables):
-    for i in range(1, len(observables)):
-
-        key = observables[i]
-
-        # Move elements of arr[0..i-1], that are
-        # greater than key, to one position ahead
-        # of their current position
-        j = i - 1
-        while j >= 0 and dt.strptime(key.date, "%Y-%m-%d") < dt.strptime(observables[j].date, "%Y-%m-%d"):
-            observables[j + 1] = observables[j]
-            j -= 1
-        observables[j + 1] = key
+def _downsample(x: np.ndarray, y: np.ndarray, buckets: int) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Min/max downsampling of a line sorted by x: the x range is split into the given number of
+    buckets (the pixel columns of the figure) and, for each bucket, the first, last, smallest and biggest points are
+    kept, in their order. The first missing value of each gap is kept too, so gaps are still drawn.
+    """
+    span = int(x[-1] - x[0]) + 1
+    bucket = (x - x[0]).astype(np.int64) * buckets // span
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(x)] - 1
+    missing = np.isnan(y)
+    # inside each bucket the points are ordered by value, missing values last
+    smallest = np.lexsort((np.where(missing, np.inf, y), bucket))[starts]
+    biggest = np.lexsort((np.where(missing, np.inf, -y), bucket))[starts]
+    gaps = np.flatnonzero(missing & ~np.r_[False, missing[:-1]])
+    keep = np.unique(np.concatenate((starts, ends, smallest, biggest, gaps)))
+    return x[keep], y[keep]
+
+
+def _graph_columns(observables) -> (np.ndarray, np.ndarray):
+    """
+    Private function. Returns the dates (datetime64[D]) and the values of observables given either as a list of
+    :class:`model.Observable` or as a (dates, values) pair of arrays, sorted by date. The sort is a single argsort,
+    skipped when the dates are already ordered.
+    """
+    if not isinstance(observables, tuple):
+        return _observables_to_arrays(observables)
+    dates = np.asarray(observables[0]).astype("datetime64[D]")
+    values = np.asarray(observables[1], dtype=np.float64)
+    if len(dates) > 1 and np.any(dates[1:] < dates[:-1]):
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        values = values[order]
+    return dates, values
 
 
 def build_series_graph(series: Series, api_key, db_name="fred.db", observables=None) -> SeriesGraph:
@@ -175,44 +249,108 @@ def build_series_graph(series: Series, api_key, db_name="fred.db", observables=N
     :type api_key: str
     :param db_name: The name of the database you want to use, defaults to fred.db
     :type db_name: str
-    :param observables: A list of observables that you want to use as values of the series, by default it is None and in this case the function use the "ufficial" values, defaults to None
-    :type observables: List[Observables]
+    :param observables: The observables that you want to use as values of the series, either as a list of observables or in columnar form as a (dates, values) pair of arrays, for example the result of :py:meth:`frame.SeriesFrame.compute`. By default it is None and in this case the function use the "ufficial" values, defaults to None
+    :type observables: List[Observables] or (np.ndarray, np.ndarray)
     :raises BadRequestException: This exception is thrown when an error occurs during http communication
     :raises NotPlottableSeries: This exception is thrown when you try to build a graph for a non plottable series. For more information see the documentation of NotPlottableSeries
     """
 
-    if observables is None:
-        observables = []
     if str(series.observation_start) == "1776-07-04" and series.observation_end == "9999-12-31":
         raise NotPlottableSeries(series)
-    if len(observables) == 0:
-        observables = get_observables(series.series_id, api_key, db_name)
-    if len(observables) <= 1:
+    if observables is None or len(observables) == 0:
+        # local data is read in columnar form, already ordered by date
+        dates, values = _get_observable_arrays(series.series_id, api_key, db_name)
+    else:
+        dates, values = _graph_columns(observables)
+    if len(dates) <= 1:
         raise NotPlottableSeries(series)
-    _sort_observables(observables)
-    dates = []
-    values = []
-    datetimes = []
-    min_values = math.inf
-    max_values = -math.inf
-    for obs in observables:
-        datetimes.append(dt.strptime(obs.date, "%Y-%m-%d"))
-        dates.append((dt.strptime(obs.date, "%Y-%m-%d") - dt(1970, 1, 1)).days)
-        values.append(obs.value)
-        if obs.value < min_values:
-            min_values = obs.value
-        if obs.value > max_values:
-            max_values = obs.value
-
-    # calculate date_list
+    days = dates.astype(np.int64)
+    min_values = float(np.nanmin(values))
+    max_values = float(np.nanmax(values))
+
+    # calculate date_list: about 15 ticks, given the sampling frequency of the series
     frequency = series.frequency_short.to_number_of_days()
+    period_of_days = int(days[-1] - days[0])
+    step = max(math.ceil(period_of_days / frequency / 15), 1)
+    date_list = dates[::step]
+    return SeriesGraph(series, date_list, min_values, max_values, days, values)
+
+
+class RenderReport:
+    """
+    This class represents the outcome of :py:func:`render_series_graphs`.
+
+    The rendered attribute is the list of the written files, failed is a dictionary mapping the name of each file that
+    could not be written to the exception raised while building or drawing its graph and elapsed is the total duration
+    of the rendering in seconds.
+    """
+
+    def __init__(self):
+        self.rendered = []
+        self.failed = {}
+        self.elapsed = 0.0
+
+    @property
+    def charts_per_second(self) -> float:
+        """
+        The number of charts written per second.
+        """
+        if self.elapsed == 0:
+            return 0.0
+        return len(self.rendered) / self.elapsed
 
-    period_of_days = (dt.strptime(observables[len(observables) - 1].date, "%Y-%m-%d") - dt.strptime(observables[0].date,
-                                                                                                    "%Y-%m-%d")).days
+    def __str__(self):
+        return "Rendered-> " + str(len(self.rendered)) + " Failed-> " + str(len(self.failed)) + " Elapsed-> " + str(
+            round(self.elapsed, 3)) + "s Charts/s-> " + str(round(self.charts_per_second, 2))
 
-    y = period_of_days / frequency
-    step = math.ceil(y / 15)
-    date_list = []
-    for i in range(0, len(datetimes), step):
-        date_list.append(datetimes[i])
-    return SeriesGraph(series, date_list, min_values, max_values, dates, values)
+
+def _render_chart(series, file_name, api_key: str, db_name: str, options: dict):
+    """
+    Private function. Runs in a worker process of :py:func:`render_series_graphs`: builds the graph of the series and
+    writes it, returning the error instead of raising it.
+    """
+    try:
+        if not isinstance(series, Series):
+            series = _resolve_series(series, api_key, db_name)
+        build_series_graph(series, api_key, db_name).save(file_name, **options)
+        return file_name, None
+    except Exception as e:
+        return file_name, e
+
+
+def render_series_graphs(charts, api_key: str, db_name="fred.db", processes=None, **options) -> RenderReport:
+    """
+    This function writes the graphs of many series to files using a pool of processes, for example:
+    render_series_graphs([("GDP", "gdp.png"), ("UNRATE", "unrate.svg")], api_key, dpi=100).
+    Each worker process builds the graph of a series with :py:func:`build_series_graph` and writes it with
+    :py:meth:`SeriesGraph.save`, so figures never reach the global state of pyplot and memory does not grow with the
+    number of charts. An error on a chart does not stop the others: it is reported in the returned :class:`RenderReport`.
+
+    :param charts: The charts to render, as (series, file name) pairs. Each series can be a :class:`model.Series` or a series id
+    :type charts: List[(Series or str, str)]
+    :param api_key: A valid Fred API Key
+    :type api_key: str
+    :param db_name: The name of the database you want to use, defaults to fred.db
+    :type db_name: str
+    :param processes: The number of worker processes, defaults to None (the number of processors of the machine)
+    :type processes: int
+    :param options: The keyword arguments passed to :py:meth:`SeriesGraph.save`, for example dpi or fig_size
+    :return: The files written, the failures and the throughput of the rendering
+    :rtype: RenderReport
+    """
+    report = RenderReport()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {executor.submit(_render_chart, series, file_name, api_key, db_name, options): file_name
+                   for series, file_name in charts}
+        for future in as_completed(futures):
+            try:
+                file_name, error = future.result()
+            except Exception as e:
+                file_name, error = futures[future], e
+            if error is None:
+                report.rendered.append(file_name)
+            else:
+                report.failed[file_name] = error
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -2,14 +2,71 @@
 This module contains the CategoryTree class which can be used to represent a list of categories with a tree structure
 """
 
-import networkx as nx
-from matplotlib import pyplot as plt
-from collections import Iterable
+from collections import deque
+from collections.abc import Iterable
+from model import Category
+import numpy as np
+import mmap
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
+# snapshot layout: header, then ids (int64), parent_ids (int64), parent positions (int32), name indexes (int32),
+# name offsets (int64) and the utf-8 names, each section aligned to 8 bytes
+_SNAPSHOT_MAGIC = b"FREDTREE"
+_SNAPSHOT_FORMAT = 1
+_SNAPSHOT_HEADER = struct.Struct("<8sIIIQI")
 
 
+class InvalidSnapshot(Exception):
+    """
+    ..autoexception::InvalidSnapshot
+
+    This exception is raised when a tree snapshot cannot be loaded: the file is not a snapshot, it was written with
+    an unsupported format or it does not match the expected version.
+
+    :param file_name: The name of the snapshot file
+    :type file_name: str
+    :param reason: The reason why the snapshot is not valid
+    :type reason: str
+    """
+
+    def __init__(self, file_name, reason):
+        super().__init__("Invalid snapshot " + str(file_name) + ": " + str(reason))
+
+
+class CategoryChangeSet:
+    """
+    This class represents the changes of a category tree found by :py:func:`sync_category_tree`.
+
+    The added and removed attributes are lists of :class:`model.Category` (the descendants of a removed category are
+    removed too), moved is a list of (category, old_parent_id) tuples where category has its new parent_id, and
+    checked is the number of categories whose children have been compared with FRED.
+    """
+
+    def __init__(self, category_id):
+        """
+
+        :param category_id: The id of the root of the synchronized tree
+        :type category_id: int
+        """
+        self.category_id = category_id
+        self.added = []
+        self.removed = []
+        self.moved = []
+        self.checked = 0
+
+    def __len__(self):
+        return len(self.added) + len(self.removed) + len(self.moved)
+
+    def __str__(self):
+        return "Category ID-> " + str(self.category_id) + " Added-> " + str(len(self.added)) + " Removed-> " + str(
+            len(self.removed)) + " Moved-> " + str(len(self.moved)) + " Checked-> " + str(self.checked)
 
 
+def _aligned(size):
+    return (size + 7) // 8 * 8
+
 
 class CategoryTree(Iterable):
     """
@@ -45,20 +102,21 @@ class CategoryTree(Iterable):
         :type category_list: List[Category]
         """
         map_of_nodes = {}
-        # self._G is used to build a printable tree
-        self._G = nx.DiGraph(directed=True)
+        # self._G is used to build a printable tree, it is only built when needed (see _graph)
+        self._G = None
+        # self._index answers ancestry queries, it is only built when needed (see _ancestry)
+        self._index = None
         self.count = len(category_list)
-        list_of_id = []
+        set_of_id = set()
         for cat in category_list:
             node = self._Node(cat)
-            self._G.add_node(cat.category_id)
-            list_of_id.append(cat.category_id)
-            if not (cat.parent_id in map_of_nodes.keys()):
+            set_of_id.add(cat.category_id)
+            if not (cat.parent_id in map_of_nodes):
                 map_of_nodes[cat.parent_id] = []
             map_of_nodes[cat.parent_id].append(node)
 
         for key in map_of_nodes.keys():
-            if not (key in list_of_id) or key == 0:
+            if not (key in set_of_id) or key == 0:
                 # This is the parent of the root!!
                 if key == 0 and len(map_of_nodes[key]) > 1:
                     for node in map_of_nodes[key]:
@@ -70,43 +128,66 @@ class CategoryTree(Iterable):
                     self.root = map_of_nodes[key][0]
                     map_of_nodes.pop(key)
                 break
-        parent = self.root
-        list_of_parents = [parent]
+        # index of the nodes reachable from the root, used for O(1) lookups
+        self._nodes = {self.root.key: self.root}
+        list_of_parents = deque([self.root])
         while len(list_of_parents) != 0:
-            if not (list_of_parents[0].value.category_id in map_of_nodes.keys()):
-                list_of_parents.pop(0)
+            parent = list_of_parents.popleft()
+            nodes = map_of_nodes.get(parent.key)
+            if nodes is None:
                 continue
-            nodes = map_of_nodes[list_of_parents[0].value.category_id]
             for node in nodes:
-                node._add_parent(list_of_parents[0])
-                self._G.add_edge(list_of_parents[0].value.category_id, node.value.category_id)
-            list_of_parents[0]._add_children(nodes)
-            list_of_parents += nodes
-            list_of_parents.pop(0)
+                node._add_parent(parent)
+                self._nodes[node.key] = node
+            parent._add_children(nodes)
+            list_of_parents.extend(nodes)
+
+    def _graph(self):
+        """
+        Private method. Returns the networkx graph of the tree, building it on first use.
+        """
+        if self._G is None:
+            import networkx as nx
+            graph = nx.DiGraph(directed=True)
+            nodes = list(self._iter_nodes())
+            graph.add_nodes_from(node.key for node in nodes)
+            graph.add_edges_from((node.parent.key, node.key) for node in nodes if node is not self.root)
+            self._G = graph
+        return self._G
+
+    def _iter_nodes(self):
+        """
+        Private method. Visits the nodes of the tree in BFS order.
+        """
+        queue = deque([self.root])
+
+        while len(queue) > 0:
+            node = queue.popleft()
+            yield node
+            queue.extend(node._get_children())
 
     def __iter__(self):
         """
         Implement a BFS. You can use this method simply by iterating over the elements of the tree using a loop for example:
         for category in tree. Returns an object of type Category
         """
-        queue = [self.root]
+        for node in self._iter_nodes():
+            yield node.value
 
-        while len(queue) > 0:
-            yield queue[0].value
-            node = queue.pop(0)
-            queue.extend(node._get_children())
+    def _get_node(self, item):
+        return self._nodes.get(item)
 
-    def __get_node(self, item):
-        queue = [self.root]
-        while len(queue) > 0:
-            for node in queue:
-                if node.value.category_id == item:
-                    return node
-            new_queue = []
-            for node in queue:
-                new_queue.extend(node._get_children())
-            queue = new_queue
-        return None
+    def __contains__(self, item):
+        """
+        This method checks in O(1) if a category is in the tree and can be used with the python in operator, for example:
+        category_id in tree or category in tree
+
+        :param item: The category_id of the category or the category itself
+        :type item: int or Category
+        :return: True if the category is in the tree, False otherwise
+        :rtype: bool
+        """
+        return getattr(item, "category_id", item) in self._nodes
 
     def __getitem__(self, item):
         """
@@ -118,38 +199,260 @@ class CategoryTree(Iterable):
         :return: The category requested, None if the category is not in the tree
         :rtype: Category
         """
-        result = self.__get_node(item)
+        result = self._get_node(item)
         if result is not None:
             return result.value
         return None
 
-    def __to_list(self, root):
-        list_of_parents = [root]
-        list_of_nodes = []
-        while len(list_of_parents) != 0:
-            list_of_parents.extend(list_of_parents[0]._get_children())
-            list_of_nodes.append(list_of_parents.pop(0).value)
-        return list_of_nodes
-
     def subtree(self, category_id):
         """
-        Use this method to build a subtree.
+        Use this method to get a subtree.
+        The subtree is a view sharing the nodes of this tree, so it is built in O(1): use its copy method if you need an independent tree.
 
         :param category_id: The category_id of the root of the subtree
         :type category_id: int
-        :return: A CategoryTree object representing the subtree, None if the category_id is not in the tree
-        :rtype: CategoryTree
+        :return: A CategoryTreeView object representing the subtree, None if the category_id is not in the tree
+        :rtype: CategoryTreeView
         """
 
-        node = self.__get_node(category_id)
+        node = self._get_node(category_id)
         if node is not None:
-            list_of_nodes = self.__to_list(node)
-            return CategoryTree(list_of_nodes)
+            return CategoryTreeView(self, node)
         return None
 
+    def copy(self):
+        """
+        Use this method to build an independent copy of the tree.
+
+        :return: A new CategoryTree with the same categories
+        :rtype: CategoryTree
+        """
+        return CategoryTree(list(self))
+
     def __len__(self):
         return self.count
 
+    def save_snapshot(self, file_name, version=""):
+        """
+        Use this method to save the tree in a compact binary file that can be loaded in a few milliseconds with load_snapshot.
+        The file stores flat arrays of ids and parent positions and a table of the distinct category names.
+
+        :param file_name: The name of the snapshot file
+        :type file_name: str
+        :param version: A string identifying the data the tree was built from, for example :py:meth:`Database.get_categories_version`, defaults to ""
+        :type version: str
+        """
+        nodes = list(self._iter_nodes())
+        position = {node.key: i for i, node in enumerate(nodes)}
+        names = {}
+        name_indexes = np.array([names.setdefault(node.value.name, len(names)) for node in nodes], dtype=np.int32)
+        encoded_names = [name.encode("utf-8") for name in names]
+        name_offsets = np.zeros(len(encoded_names) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded_names], out=name_offsets[1:])
+        sections = [np.array([node.key for node in nodes], dtype=np.int64),
+                    np.array([node.value.parent_id for node in nodes], dtype=np.int64),
+                    np.array([position[node.parent.key] if node is not self.root else -1 for node in nodes],
+                             dtype=np.int32),
+                    name_indexes, name_offsets]
+        encoded_version = str(version).encode("utf-8")
+        with open(file_name, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_FORMAT, len(nodes), len(encoded_names),
+                                             int(name_offsets[-1]), len(encoded_version)))
+            file.write(encoded_version.ljust(_aligned(len(encoded_version)), b"\0"))
+            for section in sections:
+                data = section.tobytes()
+                file.write(data.ljust(_aligned(len(data)), b"\0"))
+            file.write(b"".join(encoded_names))
+
+    @classmethod
+    def load_snapshot(cls, file_name, version=None):
+        """
+        Use this method to load a tree saved with save_snapshot. The file is memory-mapped.
+
+        :param file_name: The name of the snapshot file
+        :type file_name: str
+        :param version: The expected version of the snapshot, defaults to None (any version is accepted)
+        :type version: str
+        :raises InvalidSnapshot: If the file is not a valid snapshot or its version is not the expected one
+        :return: The loaded tree
+        :rtype: CategoryTree
+        """
+        with open(file_name, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise InvalidSnapshot(file_name, "empty file")
+        try:
+            if len(buffer) < _SNAPSHOT_HEADER.size:
+                raise InvalidSnapshot(file_name, "truncated file")
+            magic, file_format, count, name_count, names_size, version_size = _SNAPSHOT_HEADER.unpack_from(buffer)
+            if magic != _SNAPSHOT_MAGIC:
+                raise InvalidSnapshot(file_name, "not a category tree snapshot")
+            if file_format != _SNAPSHOT_FORMAT:
+                raise InvalidSnapshot(file_name, "unsupported format " + str(file_format))
+            offset = _SNAPSHOT_HEADER.size
+            saved_version = bytes(buffer[offset:offset + version_size]).decode("utf-8")
+            if version is not None and saved_version != version:
+                raise InvalidSnapshot(file_name, "version " + saved_version + " does not match " + str(version))
+            offset += _aligned(version_size)
+            sections = []
+            for dtype, size in ((np.int64, count), (np.int64, count), (np.int32, count), (np.int32, count),
+                                (np.int64, name_count + 1)):
+                sections.append(np.frombuffer(buffer, dtype=dtype, count=size, offset=offset).tolist())
+                offset += _aligned(size * np.dtype(dtype).itemsize)
+            ids, parent_ids, parents, name_indexes, name_offsets = sections
+            names_blob = bytes(buffer[offset:offset + names_size])
+        except (struct.error, ValueError) as e:
+            raise InvalidSnapshot(file_name, str(e))
+        finally:
+            buffer.close()
+        names = [names_blob[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(name_count)]
+        tree = cls.__new__(cls)
+        tree._G = None
+        tree._index = None
+        tree.count = count
+        nodes = [cls._Node(Category(ids[i], names[name_indexes[i]], parent_ids[i])) for i in range(count)]
+        # nodes are saved in BFS order, so parents always come before their children
+        for node, parent in zip(nodes, parents):
+            if parent >= 0:
+                node._add_parent(nodes[parent])
+                nodes[parent].children.append(node)
+        tree.root = nodes[0]
+        tree._nodes = {node.key: node for node in nodes}
+        return tree
+
+    def apply_changes(self, changes: CategoryChangeSet):
+        """
+        Use this method to update the tree with the changes found by :py:func:`sync_category_tree`, without rebuilding it.
+        Added categories whose parent is not in the tree are ignored, moved categories whose new parent is not in the
+        tree leave it together with their subtree.
+
+        :param changes: The changes to apply
+        :type changes: CategoryChangeSet
+        """
+        for category in changes.removed:
+            self.__detach(self._nodes.get(category.category_id))
+        for category in changes.added:
+            parent = self._nodes.get(category.parent_id)
+            if parent is not None and category.category_id not in self._nodes:
+                node = self._Node(category)
+                node._add_parent(parent)
+                parent.children.append(node)
+                self._nodes[node.key] = node
+        for category, old_parent_id in changes.moved:
+            node = self._nodes.get(category.category_id)
+            parent = self._nodes.get(category.parent_id)
+            if node is None or node is self.root:
+                continue
+            self.__detach(node)
+            if parent is not None:
+                node.value = category
+                node._add_parent(parent)
+                parent.children.append(node)
+                for moved in _subtree_nodes(node):
+                    self._nodes[moved.key] = moved
+        # the lookup index follows the changes, the graph and the ancestry index are rebuilt on next use
+        self._G = None
+        self._index = None
+        self.count = len(self._nodes)
+
+    def __detach(self, node):
+        """
+        Private method. Removes a node and its subtree from the tree.
+        """
+        if node is None or node is self.root or self._nodes.get(node.key) is not node:
+            return
+        node.parent.children.remove(node)
+        for removed in _subtree_nodes(node):
+            self._nodes.pop(removed.key, None)
+
+    def _ancestry(self):
+        """
+        Private method. Returns the ancestry index of the tree, building it on first use.
+        """
+        if self._index is None:
+            self._index = _AncestryIndex(self.root)
+        return self._index
+
+    def __position(self, category_id):
+        if self._get_node(category_id) is None:
+            raise KeyError(category_id)
+        return self._ancestry().position[category_id]
+
+    def depth(self, category_id) -> int:
+        """
+        Use this method to get the depth of a category, that is its distance from the root of the tree (the root has depth 0).
+
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :raises KeyError: If the category is not in the tree
+        :return: The depth of the category
+        :rtype: int
+        """
+        index = self._ancestry()
+        return index.depth[self.__position(category_id)] - index.depth[index.position[self.root.key]]
+
+    def descendant_count(self, category_id) -> int:
+        """
+        Use this method to get the number of descendants of a category (the category itself is not counted).
+
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :raises KeyError: If the category is not in the tree
+        :return: The number of categories under the category
+        :rtype: int
+        """
+        return self._ancestry().size[self.__position(category_id)] - 1
+
+    def is_ancestor(self, ancestor_id, category_id) -> bool:
+        """
+        Use this method to check in O(1) if a category lies under another one.
+
+        :param ancestor_id: The category_id of the candidate ancestor
+        :type ancestor_id: int
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :raises KeyError: If one of the categories is not in the tree
+        :return: True if category_id is in the subtree rooted at ancestor_id (the two ids may be equal), False otherwise
+        :rtype: bool
+        """
+        return self._ancestry().is_ancestor(self.__position(ancestor_id), self.__position(category_id))
+
+    def path(self, category_id) -> list:
+        """
+        Use this method to get the breadcrumb of a category: the categories from the root of the tree to the category.
+
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :raises KeyError: If the category is not in the tree
+        :return: The list of categories from the root to the given category, both included
+        :rtype: List[Category]
+        """
+        node = self._get_node(category_id)
+        if node is None:
+            raise KeyError(category_id)
+        path = [node.value]
+        while node is not self.root:
+            node = node.parent
+            path.append(node.value)
+        path.reverse()
+        return path
+
+    def lowest_common_ancestor(self, first_id, second_id):
+        """
+        Use this method to get the deepest category that is an ancestor of both the given categories, in O(log n).
+
+        :param first_id: The category_id of the first category
+        :type first_id: int
+        :param second_id: The category_id of the second category
+        :type second_id: int
+        :raises KeyError: If one of the categories is not in the tree
+        :return: The lowest common ancestor of the two categories
+        :rtype: Category
+        """
+        index = self._ancestry()
+        return index.nodes[index.lowest_common_ancestor(self.__position(first_id), self.__position(second_id))].value
+
     def plot(self, fig_size=(14, 14), dpi:int=100, highlighted=None):
         """
         Use this method to print the entire tree on a graph. Each node of the tree will be represented by its category_id.
@@ -163,10 +466,13 @@ class CategoryTree(Iterable):
         :param highlighted: The category that you want to highlight, it will be drawn in red, defaults to None
         :type highlighted: Category
         """
+        import networkx as nx
+        from matplotlib import pyplot as plt
 
         plt.figure(figsize=fig_size, dpi=dpi)
         color_map = []
-        for node in self._G:
+        graph = self._graph()
+        for node in graph:
             if node == self.root.value.category_id:
                 color_map.append("yellow")
                 continue
@@ -175,5 +481,297 @@ class CategoryTree(Iterable):
                     color_map.append("red")
                     continue
             color_map.append("blue")
-        nx.draw(self._G, node_color=color_map, arrows=True, with_labels=True)
+        nx.draw(graph, node_color=color_map, arrows=True, with_labels=True)
         plt.draw()
+
+
+def _subtree_nodes(node):
+    stack = [node]
+    while len(stack) != 0:
+        node = stack.pop()
+        yield node
+        stack.extend(node._get_children())
+
+
+class CategoryTreeView(CategoryTree):
+    """
+
+    This class represents a subtree of a CategoryTree, as returned by the subtree method.
+    It shares the nodes of the tree it was taken from instead of copying them: iteration, len, lookups and plot only
+    consider the categories under its root. Use the copy method to build an independent CategoryTree.
+
+    """
+
+    def __init__(self, tree, root):
+        """
+        Builder of the class. Do not use the constructor directly but use the subtree method of CategoryTree.
+
+        :param tree: The tree the subtree is taken from
+        :type tree: CategoryTree
+        :param root: The node of tree which is the root of the subtree
+        """
+        # views of views refer directly to the tree owning the nodes
+        self._tree = tree._tree if isinstance(tree, CategoryTreeView) else tree
+        self.root = root
+        self._G = None
+
+    @property
+    def count(self):
+        return self._tree.descendant_count(self.root.key) + 1
+
+    def _ancestry(self):
+        return self._tree._ancestry()
+
+    def _get_node(self, item):
+        node = self._tree._get_node(item)
+        if node is None:
+            return None
+        index = self._ancestry()
+        if not index.is_ancestor(index.position[self.root.key], index.position[node.key]):
+            return None
+        return node
+
+    def apply_changes(self, changes: CategoryChangeSet):
+        """
+        The changes are applied to the tree the subtree is taken from, see :py:meth:`CategoryTree.apply_changes`.
+
+        :param changes: The changes to apply
+        :type changes: CategoryChangeSet
+        """
+        self._tree.apply_changes(changes)
+        self._G = None
+
+    def __contains__(self, item):
+        """
+        This method checks if a category is in the subtree and can be used with the python in operator, for example:
+        category_id in tree or category in tree
+
+        :param item: The category_id of the category or the category itself
+        :type item: int or Category
+        :return: True if the category is in the subtree, False otherwise
+        :rtype: bool
+        """
+        return self._get_node(getattr(item, "category_id", item)) is not None
+
+
+class _AncestryIndex:
+    """
+    This class is private and undocumented, you must not use this class
+    """
+
+    def __init__(self, root):
+        # nodes are numbered in DFS pre-order: the subtree of node i is made of the nodes i ... i + size[i] - 1
+        self.position = {}
+        self.nodes = []
+        parents = []
+        self.depth = []
+        stack = [(root, -1, 0)]
+        while len(stack) != 0:
+            node, parent, depth = stack.pop()
+            self.position[node.key] = len(self.nodes)
+            self.nodes.append(node)
+            parents.append(parent)
+            self.depth.append(depth)
+            for child in reversed(node._get_children()):
+                stack.append((child, self.position[node.key], depth + 1))
+        self.size = [1] * len(self.nodes)
+        for i in range(len(self.nodes) - 1, 0, -1):
+            self.size[parents[i]] += self.size[i]
+        # binary lifting: up[k][i] is the ancestor of node i 2^k levels above, -1 if there is none
+        self.up = [parents]
+        while (1 << len(self.up)) < len(self.nodes):
+            previous = self.up[-1]
+            self.up.append([previous[p] if p >= 0 else -1 for p in previous])
+
+    def is_ancestor(self, ancestor, node):
+        return ancestor <= node < ancestor + self.size[ancestor]
+
+    def lowest_common_ancestor(self, first, second):
+        if self.is_ancestor(first, second):
+            return first
+        if self.is_ancestor(second, first):
+            return second
+        for level in reversed(self.up):
+            candidate = level[first]
+            if candidate >= 0 and not self.is_ancestor(candidate, second):
+                first = candidate
+        return self.up[0][first]
+
+
+class LazyCategoryTree:
+    """
+
+    This class represents a category tree whose children are loaded on first access, so that browsing the tree only
+    costs the categories actually visited. The children of a category are loaded once, then kept in memory.
+    Use the prefetch method to load the next levels of a category ahead of time, concurrently.
+
+    """
+    class _Node:
+        """
+        This class is private and undocumented, you must not use this class
+        """
+
+        def __init__(self, category):
+            self.value = category
+            self.key = category.category_id
+            self.parent = None
+            self.children = None
+
+    def __init__(self, root, load_children, max_workers=8):
+        """
+        Builder of the class. Do not use the constructor directly but use the get_lazy_category_tree function.
+
+        :param root: The root category of the tree
+        :type root: Category
+        :param load_children: A function returning the list of the children of a category, given its category_id. It must be thread-safe
+        :param max_workers: The maximum number of categories loaded concurrently by prefetch, defaults to 8
+        :type max_workers: int
+        """
+        self.root = self._Node(root)
+        self._load_children = load_children
+        self._max_workers = max_workers
+        self._nodes = {self.root.key: self.root}
+        self._lock = threading.Lock()
+
+    def _get_node(self, item):
+        node = self._nodes.get(item)
+        if node is None:
+            raise KeyError(item)
+        return node
+
+    def _expand(self, node):
+        """
+        Private method. Returns the children nodes of a node, loading them if needed.
+        """
+        if node.children is not None:
+            return node.children
+        # categories are loaded outside the lock, if two threads load the same node the first result is kept
+        categories = [category for category in self._load_children(node.key) if category.category_id != node.key]
+        with self._lock:
+            if node.children is None:
+                children = []
+                for category in categories:
+                    child = self._Node(category)
+                    child.parent = node
+                    self._nodes[child.key] = child
+                    children.append(child)
+                node.children = children
+        return node.children
+
+    def children(self, category_id) -> list:
+        """
+        Use this method to get the children of a category, they are loaded if this is the first access.
+
+        :param category_id: The category_id of a category already reached in the tree
+        :type category_id: int
+        :raises KeyError: If the category has not been reached yet (its parent has not been loaded) or it is not in the tree
+        :raises BadRequestException: If the children must be downloaded and an error occurs during http communication
+        :return: The list of the children categories
+        :rtype: List[Category]
+        """
+        return [child.value for child in self._expand(self._get_node(category_id))]
+
+    def parent(self, category_id):
+        """
+        Use this method to get the parent of a category already reached in the tree.
+
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :raises KeyError: If the category has not been reached yet
+        :return: The parent category, None for the root of the tree
+        :rtype: Category
+        """
+        node = self._get_node(category_id)
+        return None if node.parent is None else node.parent.value
+
+    def is_loaded(self, category_id) -> bool:
+        """
+        Use this method to check if the children of a category have already been loaded.
+
+        :param category_id: The category_id of the category
+        :type category_id: int
+        :return: True if the children of the category are in memory, False otherwise
+        :rtype: bool
+        """
+        node = self._nodes.get(category_id)
+        return node is not None and node.children is not None
+
+    def prefetch(self, category_id=None, levels=1):
+        """
+        Use this method to load ahead the categories of the next levels under a category, so that later accesses do not wait.
+        Each level is loaded concurrently, with at most max_workers categories loaded at the same time.
+
+        :param category_id: The category_id of the category, defaults to None (the root of the tree)
+        :type category_id: int
+        :param levels: The number of levels to load under the category, None to load the whole subtree, defaults to 1
+        :type levels: int
+        :raises KeyError: If the category has not been reached yet
+        :raises BadRequestException: If an error occurs during http communication
+        """
+        frontier = [self.root if category_id is None else self._get_node(category_id)]
+        level = 0
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            while len(frontier) != 0 and (levels is None or level < levels):
+                next_frontier = []
+                for children in executor.map(self._expand, frontier):
+                    next_frontier.extend(children)
+                frontier = next_frontier
+                level += 1
+
+    def __contains__(self, item):
+        """
+        This method checks if a category has already been reached in the tree and can be used with the python in operator, for example:
+        category_id in tree or category in tree. It never loads categories.
+
+        :param item: The category_id of the category or the category itself
+        :type item: int or Category
+        :return: True if the category has been reached, False otherwise
+        :rtype: bool
+        """
+        return getattr(item, "category_id", item) in self._nodes
+
+    def __getitem__(self, item):
+        """
+        This method returns a category already reached in the tree and can be used with the python [] operator, for example:
+        root_category = tree [0]. Returns None if the category has not been reached
+
+        :param item: Must be the category_id of the category
+        :type item: int
+        :return: The category requested, None if it has not been reached
+        :rtype: Category
+        """
+        node = self._nodes.get(item)
+        if node is not None:
+            return node.value
+        return None
+
+    def __iter__(self):
+        """
+        Implement a BFS over the whole tree, loading every category that has not been loaded yet.
+        Returns objects of type Category
+        """
+        queue = deque([self.root])
+        while len(queue) > 0:
+            node = queue.popleft()
+            yield node.value
+            queue.extend(self._expand(node))
+
+    def loaded_count(self) -> int:
+        """
+        Use this method to get the number of categories reached so far.
+
+        :return: The number of categories in memory
+        :rtype: int
+        """
+        return len(self._nodes)
+
+    def to_tree(self) -> CategoryTree:
+        """
+        Use this method to load the whole tree, concurrently, and convert it to a :class:`CategoryTree`.
+
+        :raises BadRequestException: If an error occurs during http communication
+        :return: A CategoryTree with all the categories under the root
+        :rtype: CategoryTree
+        """
+        self.prefetch(levels=None)
+        return CategoryTree(list(self))